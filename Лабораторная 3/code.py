@@ -3,8 +3,12 @@
 Реализация групповых и циклических кодов для обнаружения и исправления ошибок
 """
 
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import cached_property
+
 import numpy as np
-from typing import List, Tuple, Optional
+from typing import BinaryIO, List, Tuple, Optional
 
 class GroupCode:
     """
@@ -17,22 +21,137 @@ class GroupCode:
         n (int): Общая длина кодового слова
     """
     
-    def __init__(self, check_matrix: List[List[int]]) -> None:
+    def __init__(self, check_matrix: List[List[int]], verbose: bool = True) -> None:
         """
         Инициализация группового кода
         
         Args:
             check_matrix: Проверочная матрица размером n_i x n_k
+            verbose: Печатать ли параметры созданного кода
         """
         self.check_matrix = np.array(check_matrix)
         self.n_k = self.check_matrix.shape[1]  # число контрольных разрядов
         self.n_i = self.check_matrix.shape[0]  # число информационных разрядов
         self.n = self.n_i + self.n_k  # общая длина кода
+
+        if not verbose:
+            return
         
         print(f"Создан групповой код с параметрами:")
         print(f"  Информационные разряды: {self.n_i}")
         print(f"  Контрольные разряды: {self.n_k}")
         print(f"  Общая длина: {self.n}")
+
+    @cached_property
+    def generator_matrix(self) -> np.ndarray:
+        """
+        Порождающая матрица кода в систематическом виде [I | P]
+
+        Returns:
+            Матрица размером n_i x n, строка i — кодовое слово для i-го информационного бита
+        """
+        identity = np.eye(self.n_i, dtype=self.check_matrix.dtype)
+        return np.hstack((identity, self.check_matrix))
+
+    @cached_property
+    def parity_check_matrix(self) -> np.ndarray:
+        """
+        Полная проверочная матрица кода в систематическом виде [P^T | I]
+
+        Returns:
+            Матрица размером n_k x n, произведение кодового слова на её транспонированную — синдром
+        """
+        identity = np.eye(self.n_k, dtype=self.check_matrix.dtype)
+        return np.hstack((self.check_matrix.T, identity))
+
+    def encode_batch(self, info_parts: np.ndarray) -> np.ndarray:
+        """
+        Кодирование сразу многих информационных частей (без вывода на экран)
+
+        Args:
+            info_parts: Матрица m x n_i из нулей и единиц
+
+        Returns:
+            Матрица m x n кодовых слов
+        """
+        info_parts = np.asarray(info_parts, dtype=np.uint8)
+        control = (info_parts.astype(np.int32) @ self.check_matrix) & 1
+        return np.hstack((info_parts, control.astype(np.uint8)))
+
+    def syndrome_batch(self, codes: np.ndarray) -> np.ndarray:
+        """
+        Вычисление синдромов сразу для многих кодовых слов (без вывода на экран)
+
+        Args:
+            codes: Матрица m x n из нулей и единиц
+
+        Returns:
+            Матрица m x n_k синдромов
+        """
+        codes = np.asarray(codes, dtype=np.int32)
+        return ((codes @ self.parity_check_matrix.T) & 1).astype(np.uint8)
+
+    @cached_property
+    def syndrome_table(self) -> np.ndarray:
+        """
+        Таблица лидеров смежных классов: для каждого синдрома — вектор ошибки наименьшего веса
+
+        Строится обходом в ширину по синдромам: синдром вектора веса w — это
+        синдром вектора веса w - 1 плюс столбец проверочной матрицы, поэтому
+        каждый следующий слой получается из предыдущего добавлением одного
+        столбца. Память и время ограничены числом синдромов 2^n_k, а не числом
+        векторов ошибок, которое для длинных кодов растёт как C(n, w).
+
+        Returns:
+            Матрица 2^n_k x n (номер строки — синдром, упакованный от старшего бита)
+        """
+        if self.n_k > 20:
+            raise ValueError("Таблица синдромов строится только для n_k <= 20")
+        size = 1 << self.n_k
+        table = np.zeros((size, self.n), dtype=np.uint8)
+        filled = np.zeros(size, dtype=bool)
+        filled[0] = True
+        # Синдромы одиночных ошибок — упакованные столбцы проверочной матрицы
+        columns = self._pack_syndromes(self.syndrome_batch(np.eye(self.n, dtype=np.uint8)))
+        frontier = np.zeros(1, dtype=np.int64)
+        # Сколько синдромов фронта обрабатывать за раз, чтобы кандидатов было не больше ~2^20
+        step = max(1, (1 << 20) // self.n)
+        while frontier.size and not filled.all():
+            layer = []
+            for start in range(0, frontier.size, step):
+                sources = frontier[start:start + step]
+                candidates = (sources[:, None] ^ columns[None, :]).ravel()
+                fresh = np.flatnonzero(~filled[candidates])
+                keys, first = np.unique(candidates[fresh], return_index=True)
+                first = fresh[first]
+                rows = table[sources[first // self.n]]
+                rows[np.arange(len(keys)), first % self.n] ^= 1
+                table[keys] = rows
+                filled[keys] = True
+                layer.append(keys)
+            frontier = np.concatenate(layer)
+        return table
+
+    def _pack_syndromes(self, syndromes: np.ndarray) -> np.ndarray:
+        """Упаковка строк синдромов в целые числа (первый бит — старший)"""
+        weights = 1 << np.arange(self.n_k - 1, -1, -1, dtype=np.int64)
+        return syndromes.astype(np.int64) @ weights
+
+    def decode_batch(self, codes: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Пакетное исправление ошибок по таблице лидеров смежных классов
+
+        Args:
+            codes: Матрица m x n принятых слов
+
+        Returns:
+            Кортеж (corrected, errors):
+            - corrected: Исправленные кодовые слова m x n
+            - errors: Вес исправленного вектора ошибки для каждого слова
+        """
+        codes = np.asarray(codes, dtype=np.uint8)
+        errors = self.syndrome_table[self._pack_syndromes(self.syndrome_batch(codes))]
+        return codes ^ errors, errors.sum(axis=1, dtype=np.int64)
         
     def generate_code(self, info_part: List[int]) -> List[int]:
         """
@@ -142,21 +261,77 @@ class CyclicCode:
     Attributes:
         generator_poly (List[int]): Коэффициенты образующего многочлена
         degree (int): Степень образующего многочлена
+        n (Optional[int]): Длина кодового слова, если задана
+        n_k (int): Число контрольных разрядов (равно степени многочлена)
+        n_i (Optional[int]): Число информационных разрядов, если задана длина
     """
     
-    def __init__(self, generator_poly: List[int]) -> None:
+    def __init__(self, generator_poly: List[int], n: Optional[int] = None) -> None:
         """
         Инициализация циклического кода
         
         Args:
             generator_poly: Коэффициенты образующего многочлена от старшей степени
+            n: Длина кодового слова; нужна для матричного (пакетного) представления кода
         """
         self.generator_poly = generator_poly
         self.degree = len(generator_poly) - 1
+        self.n = n
+        self.n_k = self.degree
+        self.n_i = n - self.degree if n is not None else None
         
         print(f"\nСоздан циклический код:")
         print(f"  Образующий многочлен: {self.poly_to_str(generator_poly)}")
         print(f"  Степень многочлена: {self.degree}")
+        if n is not None:
+            print(f"  Длина кода: {n}, информационных разрядов: {self.n_i}")
+
+    @cached_property
+    def group_code(self) -> GroupCode:
+        """
+        Эквивалентный систематический групповой код длины n
+
+        Строка i матрицы P — остаток от деления x^(n-1-i) на образующий многочлен,
+        поэтому контрольные биты совпадают с encode, а синдром — с остатком decode.
+        Матрицы строятся один раз при первом обращении.
+        """
+        if self.n is None:
+            raise ValueError("Для матричного представления нужно задать длину кода n")
+        if self.n <= self.degree:
+            raise ValueError("Длина кода должна превышать степень многочлена")
+        rows = []
+        for i in range(self.n_i):
+            unit = [0] * self.n
+            unit[i] = 1
+            rows.append(self._remainder(unit))
+        return GroupCode(rows, verbose=False)
+
+    @property
+    def check_matrix(self) -> np.ndarray:
+        """Матрица P размером n_i x n_k (как у GroupCode)"""
+        return self.group_code.check_matrix
+
+    @property
+    def generator_matrix(self) -> np.ndarray:
+        """Систематическая порождающая матрица [I | P]"""
+        return self.group_code.generator_matrix
+
+    @property
+    def parity_check_matrix(self) -> np.ndarray:
+        """Систематическая проверочная матрица [P^T | I]"""
+        return self.group_code.parity_check_matrix
+
+    def encode_batch(self, info_parts: np.ndarray) -> np.ndarray:
+        """Пакетное кодирование, см. GroupCode.encode_batch"""
+        return self.group_code.encode_batch(info_parts)
+
+    def syndrome_batch(self, codes: np.ndarray) -> np.ndarray:
+        """Пакетное вычисление остатков (синдромов), см. GroupCode.syndrome_batch"""
+        return self.group_code.syndrome_batch(codes)
+
+    def decode_batch(self, codes: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Пакетное исправление ошибок, см. GroupCode.decode_batch"""
+        return self.group_code.decode_batch(codes)
     
     def poly_to_str(self, poly: List[int]) -> str:
         """Преобразование многочлена в строковое представление"""
@@ -182,11 +357,17 @@ class CyclicCode:
         Returns:
             Остаток от деления
         """
+        print(f"  Деление: {self.poly_to_str(dividend)} / {self.poly_to_str(self.generator_poly)}")
+        remainder = self._remainder(dividend)
+        print(f"  Остаток: {self.poly_to_str(remainder)}")
+        
+        return remainder
+
+    def _remainder(self, dividend: List[int]) -> List[int]:
+        """Остаток от деления на образующий многочлен (без вывода на экран)"""
         dividend = dividend.copy()
         divisor = self.generator_poly
         
-        print(f"  Деление: {self.poly_to_str(dividend)} / {self.poly_to_str(divisor)}")
-        
         # Процесс деления в столбик
         while len(dividend) >= len(divisor):
             if dividend[0] == 1:
@@ -197,10 +378,7 @@ class CyclicCode:
             dividend = dividend[1:]
         
         # Дополнение нулями до длины degree
-        remainder = dividend + [0] * (self.degree - len(dividend))
-        print(f"  Остаток: {self.poly_to_str(remainder)}")
-        
-        return remainder
+        return dividend + [0] * (self.degree - len(dividend))
     
     def encode(self, info_part: List[int]) -> List[int]:
         """
@@ -295,6 +473,846 @@ class CyclicCode:
         return corrected_code
 
 
+# Примитивные многочлены для полей GF(2^m) (старший бит — x^m)
+PRIMITIVE_POLYS = {
+    2: 0x7, 3: 0xB, 4: 0x13, 5: 0x25, 6: 0x43, 7: 0x89, 8: 0x11D,
+    9: 0x211, 10: 0x409, 11: 0x805, 12: 0x1053, 13: 0x201B, 14: 0x4443,
+    15: 0x8003, 16: 0x1100B,
+}
+
+
+class GaloisField:
+    """
+    Поле GF(2^m) с таблицами логарифмов и антилогарифмов
+
+    Attributes:
+        m (int): Степень расширения поля
+        size (int): Число элементов поля 2^m
+        order (int): Порядок мультипликативной группы 2^m - 1
+        exp (np.ndarray): Антилогарифмы alpha^i, продублированы на 2 * order элементов
+        log (np.ndarray): Логарифмы элементов (log[0] не используется)
+    """
+
+    def __init__(self, m: int, primitive_poly: Optional[int] = None) -> None:
+        """
+        Построение таблиц поля
+
+        Args:
+            m: Степень расширения (2..16)
+            primitive_poly: Примитивный многочлен в виде целого числа
+        """
+        if primitive_poly is None:
+            if m not in PRIMITIVE_POLYS:
+                raise ValueError(f"Нет примитивного многочлена для m = {m}")
+            primitive_poly = PRIMITIVE_POLYS[m]
+        self.m = m
+        self.size = 1 << m
+        self.order = self.size - 1
+        self.primitive_poly = primitive_poly
+
+        exp = [0] * (2 * self.order)
+        log = [0] * self.size
+        value = 1
+        for i in range(self.order):
+            exp[i] = value
+            log[value] = i
+            value <<= 1
+            if value & self.size:
+                value ^= primitive_poly
+        if value != 1:
+            raise ValueError("Многочлен не является примитивным")
+        # Дублирование избавляет от взятия остатка при умножении
+        exp[self.order:] = exp[:self.order]
+
+        self._exp = exp
+        self._log = log
+        self.exp = np.array(exp, dtype=np.int64)
+        self.log = np.array(log, dtype=np.int64)
+
+    @cached_property
+    def mul_table(self) -> np.ndarray:
+        """Полная таблица умножения size x size (строится при первом обращении)"""
+        log_a = self.log[:, None]
+        log_b = self.log[None, :]
+        table = self.exp[(log_a + log_b) % self.order]
+        table[0, :] = 0
+        table[:, 0] = 0
+        return table.astype(np.uint8 if self.m <= 8 else np.uint16)
+
+    def mul(self, a: int, b: int) -> int:
+        """Умножение элементов поля"""
+        if a == 0 or b == 0:
+            return 0
+        return self._exp[self._log[a] + self._log[b]]
+
+    def div(self, a: int, b: int) -> int:
+        """Деление элементов поля"""
+        if b == 0:
+            raise ZeroDivisionError("Деление на ноль в поле Галуа")
+        if a == 0:
+            return 0
+        return self._exp[(self._log[a] - self._log[b]) % self.order]
+
+    def power(self, a: int, e: int) -> int:
+        """Возведение элемента поля в целую степень"""
+        if a == 0:
+            return 0
+        return self._exp[(self._log[a] * e) % self.order]
+
+    def poly_eval(self, poly: List[int], x: int) -> int:
+        """Значение многочлена (коэффициенты от старшей степени) в точке x по схеме Горнера"""
+        result = 0
+        for coeff in poly:
+            result = self.mul(result, x) ^ coeff
+        return result
+
+    def berlekamp_massey(self, syndromes: List[int]) -> List[int]:
+        """
+        Многочлен локаторов ошибок по последовательности синдромов
+
+        Args:
+            syndromes: Синдромы S_0..S_{2t-1} подряд идущих корней
+
+        Returns:
+            Коэффициенты многочлена локаторов от младшей степени (lambda[0] = 1)
+        """
+        locator = [1]
+        previous = [1]
+        length = 0
+        shift = 1
+        last_discrepancy = 1
+
+        for step, syndrome in enumerate(syndromes):
+            discrepancy = syndrome
+            for i in range(1, length + 1):
+                discrepancy ^= self.mul(locator[i], syndromes[step - i])
+
+            if discrepancy == 0:
+                shift += 1
+                continue
+
+            coeff = self.div(discrepancy, last_discrepancy)
+            updated = locator + [0] * max(0, len(previous) + shift - len(locator))
+            for i, value in enumerate(previous):
+                updated[i + shift] ^= self.mul(coeff, value)
+
+            if 2 * length <= step:
+                previous = locator
+                length = step + 1 - length
+                last_discrepancy = discrepancy
+                shift = 1
+            else:
+                shift += 1
+            locator = updated
+
+        return locator[:length + 1]
+
+    def chien_search(self, locator: List[int], n: int) -> np.ndarray:
+        """
+        Поиск корней многочлена локаторов для всех степеней 0..n-1 одним векторным проходом
+
+        Args:
+            locator: Коэффициенты многочлена локаторов от младшей степени
+            n: Длина кода
+
+        Returns:
+            Степени e, для которых locator(alpha^-e) = 0 (позиции ошибок)
+        """
+        degrees = np.arange(n, dtype=np.int64)
+        values = np.zeros(n, dtype=np.int64)
+        for j, coeff in enumerate(locator):
+            if coeff:
+                values ^= self.exp[(self._log[coeff] - j * degrees) % self.order]
+        return np.flatnonzero(values == 0)
+
+
+class BCHCode:
+    """
+    Двоичный примитивный код БЧХ, исправляющий до t ошибок
+
+    Кодирование систематическое (информационная часть, затем остаток), как в
+    CyclicCode; пакетные операции выполняются через эквивалентный GroupCode.
+
+    Attributes:
+        field (GaloisField): Поле GF(2^m)
+        n (int): Длина кода 2^m - 1
+        k (int): Число информационных разрядов (он же n_i, как у GroupCode)
+        n_k (int): Число контрольных разрядов
+        t (int): Число исправляемых ошибок
+        generator_poly (List[int]): Образующий многочлен от старшей степени
+    """
+
+    def __init__(self, m: int, t: int, verbose: bool = True) -> None:
+        """
+        Построение образующего многочлена как НОК минимальных многочленов alpha..alpha^2t
+
+        Args:
+            m: Степень расширения поля
+            t: Число исправляемых ошибок
+            verbose: Печатать ли параметры созданного кода
+        """
+        self.field = GaloisField(m)
+        self.n = self.field.order
+        self.t = t
+
+        generator = 1
+        used = set()
+        for power in range(1, 2 * t + 1):
+            if power % self.n in used:
+                continue
+            # Циклотомический класс степени power
+            coset = []
+            value = power % self.n
+            while value not in coset:
+                coset.append(value)
+                value = value * 2 % self.n
+            used.update(coset)
+            generator = self._poly_mul_gf2(generator, self._minimal_poly(coset))
+
+        degree = generator.bit_length() - 1
+        self.k = self.n - degree
+        if self.k <= 0:
+            raise ValueError(f"Код БЧХ длины {self.n} не может исправлять {t} ошибок")
+        self.n_i = self.k
+        self.n_k = degree
+        self.generator_poly = [(generator >> i) & 1 for i in range(degree, -1, -1)]
+
+        # Строки P — остатки x^(n-1-i) mod g(x)
+        rows = []
+        for i in range(self.k):
+            remainder = self._poly_mod_gf2(1 << (self.n - 1 - i), generator)
+            rows.append([(remainder >> j) & 1 for j in range(degree - 1, -1, -1)])
+        self.group_code = GroupCode(rows, verbose=False)
+
+        # Матрица синдромов: столбцы — биты alpha^(j * e) для j = 1..2t
+        degrees = np.arange(self.n - 1, -1, -1, dtype=np.int64)
+        powers = np.stack([self.field.exp[(j * degrees) % self.n] for j in range(1, 2 * t + 1)], axis=1)
+        bits = (powers[:, :, None] >> np.arange(m)) & 1
+        self._syndrome_matrix = bits.reshape(self.n, 2 * t * m).astype(np.int32)
+        self._bit_weights = 1 << np.arange(m, dtype=np.int64)
+
+        if verbose:
+            print(f"\nСоздан код БЧХ ({self.n}, {self.k}), исправляющий {t} ошибок")
+            print(f"  Образующий многочлен степени {degree}")
+
+    def _minimal_poly(self, coset: List[int]) -> int:
+        """Минимальный многочлен класса сопряжённых элементов (двоичные коэффициенты)"""
+        poly = [1]  # коэффициенты в поле от младшей степени
+        for power in coset:
+            root = self.field._exp[power]
+            shifted = [0] + poly
+            for i, coeff in enumerate(poly):
+                shifted[i] ^= self.field.mul(coeff, root)
+            poly = shifted
+        return sum(coeff << i for i, coeff in enumerate(poly))
+
+    @staticmethod
+    def _poly_mul_gf2(a: int, b: int) -> int:
+        """Умножение двоичных многочленов, упакованных в целые числа"""
+        result = 0
+        while b:
+            if b & 1:
+                result ^= a
+            a <<= 1
+            b >>= 1
+        return result
+
+    @staticmethod
+    def _poly_mod_gf2(a: int, b: int) -> int:
+        """Остаток от деления двоичных многочленов"""
+        degree = b.bit_length()
+        while a.bit_length() >= degree:
+            a ^= b << (a.bit_length() - degree)
+        return a
+
+    @property
+    def check_matrix(self) -> np.ndarray:
+        """Матрица P размером k x n_k (как у GroupCode)"""
+        return self.group_code.check_matrix
+
+    def encode_batch(self, info_parts: np.ndarray) -> np.ndarray:
+        """
+        Пакетное систематическое кодирование
+
+        Args:
+            info_parts: Матрица m x k из нулей и единиц
+
+        Returns:
+            Матрица m x n кодовых слов
+        """
+        return self.group_code.encode_batch(info_parts)
+
+    def syndrome_batch(self, codes: np.ndarray) -> np.ndarray:
+        """
+        Синдромы S_1..S_2t для многих слов одним умножением матриц над GF(2)
+
+        Args:
+            codes: Матрица m x n из нулей и единиц
+
+        Returns:
+            Матрица m x 2t элементов поля
+        """
+        codes = np.asarray(codes, dtype=np.int32)
+        bits = (codes @ self._syndrome_matrix) & 1
+        bits = bits.reshape(codes.shape[0], 2 * self.t, self.field.m)
+        return bits @ self._bit_weights
+
+    def decode_batch(self, codes: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Пакетное декодирование: Берлекэмп–Мэсси и поиск Ченя только для слов с ошибками
+
+        Args:
+            codes: Матрица m x n принятых слов
+
+        Returns:
+            Кортеж (corrected, errors):
+            - corrected: Исправленные кодовые слова m x n
+            - errors: Число исправленных ошибок в каждом слове, -1 если исправить нельзя
+        """
+        corrected = np.array(codes, dtype=np.uint8)
+        syndromes = self.syndrome_batch(corrected)
+        errors = np.zeros(corrected.shape[0], dtype=np.int64)
+
+        for row in np.flatnonzero(syndromes.any(axis=1)):
+            locator = self.field.berlekamp_massey([int(s) for s in syndromes[row]])
+            degrees = self.field.chien_search(locator, self.n)
+            if len(locator) - 1 > self.t or degrees.size != len(locator) - 1:
+                errors[row] = -1
+                continue
+            corrected[row, self.n - 1 - degrees] ^= 1
+            errors[row] = degrees.size
+        return corrected, errors
+
+    def encode(self, info_part: List[int]) -> List[int]:
+        """Кодирование одной информационной части длины k"""
+        if len(info_part) != self.k:
+            raise ValueError(f"Длина информационной части должна быть {self.k}")
+        return self.encode_batch([info_part])[0].tolist()
+
+    def decode(self, received_code: List[int]) -> Tuple[List[int], int]:
+        """
+        Исправление ошибок в одном принятом слове
+
+        Returns:
+            Кортеж (corrected, errors) — исправленное слово и число исправленных ошибок (-1 при отказе)
+        """
+        if len(received_code) != self.n:
+            raise ValueError(f"Длина кода должна быть {self.n}")
+        corrected, errors = self.decode_batch([received_code])
+        return corrected[0].tolist(), int(errors[0])
+
+
+class ReedSolomonCode:
+    """
+    Байтовый код Рида–Соломона над GF(2^8)
+
+    Attributes:
+        field (GaloisField): Поле GF(2^8)
+        n (int): Длина кодового слова в байтах (не более 255, меньшие — укороченный код)
+        k (int): Число информационных байтов
+        nsym (int): Число проверочных байтов n - k
+        fcr (int): Степень первого корня образующего многочлена
+    """
+
+    def __init__(self, n: int = 255, k: int = 223, fcr: int = 0) -> None:
+        """
+        Args:
+            n: Длина кодового слова в байтах
+            k: Число информационных байтов
+            fcr: Степень первого корня образующего многочлена
+        """
+        if not 0 < k < n <= 255:
+            raise ValueError("Требуется 0 < k < n <= 255")
+        self.field = GaloisField(8)
+        self.n = n
+        self.k = k
+        self.nsym = n - k
+        self.fcr = fcr
+
+        # g(x) = (x - alpha^fcr)(x - alpha^(fcr+1))...; коэффициенты от старшей степени
+        generator = [1]
+        for i in range(self.nsym):
+            root = self.field._exp[(fcr + i) % self.field.order]
+            shifted = generator + [0]
+            for j, coeff in enumerate(generator):
+                shifted[j + 1] ^= self.field.mul(coeff, root)
+            generator = shifted
+        self.generator_poly = generator
+        self._generator = np.array(generator[1:], dtype=np.intp)
+        self._roots = np.array([self.field._exp[(fcr + i) % self.field.order]
+                                for i in range(self.nsym)], dtype=np.intp)
+
+    def encode_batch(self, messages: np.ndarray) -> np.ndarray:
+        """
+        Пакетное систематическое кодирование (сдвиговый регистр по таблице умножения)
+
+        Args:
+            messages: Массив m x k байтов (uint8)
+
+        Returns:
+            Массив m x n байтов: сообщение, затем проверочные байты
+        """
+        messages = np.asarray(messages, dtype=np.uint8)
+        table = self.field.mul_table
+        parity = np.zeros((messages.shape[0], self.nsym), dtype=np.uint8)
+        for i in range(self.k):
+            feedback = (messages[:, i] ^ parity[:, 0]).astype(np.intp)
+            parity[:, :-1] = parity[:, 1:]
+            parity[:, -1] = 0
+            parity ^= table[feedback[:, None], self._generator[None, :]]
+        return np.hstack((messages, parity))
+
+    def syndrome_batch(self, codes: np.ndarray) -> np.ndarray:
+        """
+        Синдромы r(alpha^(fcr+j)) для многих слов (схема Горнера по всем словам сразу)
+
+        Args:
+            codes: Массив m x n байтов
+
+        Returns:
+            Массив m x nsym синдромов
+        """
+        codes = np.asarray(codes, dtype=np.uint8)
+        table = self.field.mul_table
+        syndromes = np.zeros((codes.shape[0], self.nsym), dtype=np.uint8)
+        for i in range(self.n):
+            syndromes = table[syndromes.astype(np.intp), self._roots[None, :]] ^ codes[:, i, None]
+        return syndromes
+
+    def _correct(self, code: np.ndarray, syndromes: List[int]) -> int:
+        """Исправление одного слова на месте; возвращает число ошибок или -1"""
+        field = self.field
+        locator = field.berlekamp_massey(syndromes)
+        count = len(locator) - 1
+        degrees = field.chien_search(locator, self.n)
+        if 2 * count > self.nsym or degrees.size != count:
+            return -1
+
+        # Многочлен значений ошибок Omega(x) = S(x) * Lambda(x) mod x^nsym
+        omega = [0] * self.nsym
+        for i, s in enumerate(syndromes):
+            for j, coeff in enumerate(locator):
+                if i + j < self.nsym:
+                    omega[i + j] ^= field.mul(s, coeff)
+
+        # Алгоритм Форни: e = X^(1-fcr) * Omega(X^-1) / Lambda'(X^-1)
+        for degree in degrees:
+            x = field._exp[int(degree)]
+            x_inv = field._exp[(field.order - int(degree)) % field.order]
+            numerator = 0
+            for j in range(len(omega) - 1, -1, -1):
+                numerator = field.mul(numerator, x_inv) ^ omega[j]
+            denominator = 0
+            for j in range(1, len(locator), 2):
+                denominator ^= field.mul(locator[j], field.power(x_inv, j - 1))
+            if denominator == 0:
+                return -1
+            magnitude = field.mul(field.power(x, 1 - self.fcr), field.div(numerator, denominator))
+            code[self.n - 1 - int(degree)] ^= magnitude
+        return count
+
+    def decode_batch(self, codes: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Пакетное декодирование; алгебраическое исправление только для слов с ненулевым синдромом
+
+        Args:
+            codes: Массив m x n принятых байтов
+
+        Returns:
+            Кортеж (messages, errors):
+            - messages: Массив m x k исправленных сообщений
+            - errors: Число исправленных байтов в каждом слове, -1 если исправить нельзя
+        """
+        corrected = np.array(codes, dtype=np.uint8)
+        syndromes = self.syndrome_batch(corrected)
+        errors = np.zeros(corrected.shape[0], dtype=np.int64)
+        for row in np.flatnonzero(syndromes.any(axis=1)):
+            errors[row] = self._correct(corrected[row], [int(s) for s in syndromes[row]])
+        return corrected[:, :self.k], errors
+
+    def encode(self, data: bytes) -> bytes:
+        """Кодирование одного блока из k байтов"""
+        if len(data) != self.k:
+            raise ValueError(f"Длина блока должна быть {self.k} байт")
+        return self.encode_batch(np.frombuffer(data, dtype=np.uint8)[None, :])[0].tobytes()
+
+    def decode(self, data: bytes) -> bytes:
+        """Декодирование одного блока из n байтов с исправлением до nsym // 2 ошибок"""
+        if len(data) != self.n:
+            raise ValueError(f"Длина блока должна быть {self.n} байт")
+        messages, errors = self.decode_batch(np.frombuffer(data, dtype=np.uint8)[None, :])
+        if errors[0] < 0:
+            raise ValueError("Слишком много ошибок для исправления")
+        return messages[0].tobytes()
+
+
+class InterleavedCodec:
+    """
+    Потоковое помехоустойчивое кодирование байтов с перемежением
+
+    Данные режутся на группы по depth информационных слов. Внутри группы
+    хранятся не слова, а «срезы»: срез j — это j-е биты всех depth слов,
+    упакованные в depth / 8 байт. Контрольные срезы получаются XOR срезов
+    по столбцам матрицы P сразу для всех слов группы, а выходной поток — это
+    срезы подряд, то есть слова перемежены с глубиной depth: пакет ошибок
+    длиной до depth бит задевает каждое слово не более одного раза.
+
+    Конец данных отмечается байтом 0x80 с последующими нулями
+    (ISO/IEC 7816-4), поэтому длина заранее не нужна и защищена кодом.
+
+    Attributes:
+        code: Систематический код с n, n_i, n_k, check_matrix и decode_batch
+        depth (int): Глубина перемежения (кратна 8)
+        group_size (int): Число входных байтов в одной группе
+        block_size (int): Число выходных байтов в одной группе
+        corrected_words (int): Число слов, исправленных при последнем декодировании
+    """
+
+    def __init__(self, code, depth: int = 64) -> None:
+        """
+        Args:
+            code: GroupCode, CyclicCode с заданной длиной или BCHCode
+            depth: Глубина перемежения в словах, кратная 8
+        """
+        if depth <= 0 or depth % 8:
+            raise ValueError("Глубина перемежения должна быть положительной и кратной 8")
+        self.code = code
+        self.depth = depth
+        self.width = depth // 8
+        self.group_size = code.n_i * self.width
+        self.block_size = code.n * self.width
+        self.corrected_words = 0
+
+        # Для каждого контрольного бита — номера информационных срезов, входящих в XOR
+        matrix = np.asarray(code.check_matrix)
+        self._columns = [np.flatnonzero(matrix[:, i]) for i in range(code.n_k)]
+        # Срезы обрабатываются словами по 64 бита, если ширина позволяет
+        self._word_type = np.uint64 if self.width % 8 == 0 else np.uint8
+
+    def _control_slices(self, info: np.ndarray) -> np.ndarray:
+        """Контрольные срезы (groups x n_k x width) по информационным срезам"""
+        words = info.view(self._word_type)
+        control = np.zeros((words.shape[0], self.code.n_k, words.shape[2]), dtype=self._word_type)
+        for i, columns in enumerate(self._columns):
+            for j in columns:
+                control[:, i] ^= words[:, j]
+        return control.view(np.uint8)
+
+    def encode(self, data: bytes) -> bytes:
+        """
+        Кодирование произвольных байтов
+
+        Args:
+            data: Исходные данные
+
+        Returns:
+            Закодированный и перемеженный поток (кратен block_size)
+        """
+        padding = self.group_size - len(data) % self.group_size
+        buffer = np.frombuffer(bytes(data) + b'\x80' + bytes(padding - 1), dtype=np.uint8)
+        info = buffer.reshape(-1, self.code.n_i, self.width)
+        return np.concatenate((info, self._control_slices(info)), axis=1).tobytes()
+
+    def _decode_groups(self, data: bytes) -> np.ndarray:
+        """Исправление ошибок в целых группах; возвращает информационные байты"""
+        if len(data) % self.block_size:
+            raise ValueError(f"Длина потока должна быть кратна {self.block_size} байт")
+        received = np.frombuffer(data, dtype=np.uint8).reshape(-1, self.code.n, self.width).copy()
+        info = received[:, :self.code.n_i]
+        syndrome = self._control_slices(info) ^ received[:, self.code.n_i:]
+
+        # Ненулевой синдром хотя бы в одном срезе — слово требует исправления
+        bad = np.unpackbits(np.bitwise_or.reduce(syndrome, axis=1), axis=1)
+        groups, words = np.nonzero(bad)
+        self.corrected_words += groups.size
+        if groups.size:
+            columns = words // 8
+            shifts = (7 - words % 8).astype(np.uint8)
+            bits = (received[groups, :, columns] >> shifts[:, None]) & 1
+            corrected, _ = self.code.decode_batch(bits)
+            diff = (corrected ^ bits)[:, :self.code.n_i]
+            rows, positions = np.nonzero(diff)
+            np.bitwise_xor.at(info, (groups[rows], positions, columns[rows]),
+                              (1 << shifts[rows]).astype(np.uint8))
+        return info.reshape(-1)
+
+    @staticmethod
+    def _strip_padding(data: bytes) -> bytes:
+        """Удаление завершающих 0x80 00 .. 00"""
+        stripped = data.rstrip(b'\x00')
+        if not stripped.endswith(b'\x80'):
+            raise ValueError("Повреждён маркер конца данных")
+        return stripped[:-1]
+
+    def decode(self, data: bytes) -> bytes:
+        """
+        Декодирование потока с исправлением ошибок
+
+        Args:
+            data: Поток, полученный encode (возможно, с ошибками)
+
+        Returns:
+            Исходные данные
+        """
+        self.corrected_words = 0
+        return self._strip_padding(self._decode_groups(data).tobytes())
+
+    def encode_stream(self, source: BinaryIO, target: BinaryIO, chunk_size: int = 1 << 20) -> None:
+        """
+        Кодирование файла или другого потока частями постоянного размера
+
+        Args:
+            source: Источник байтов (метод read)
+            target: Приёмник байтов (метод write)
+            chunk_size: Примерный размер читаемой части в байтах
+        """
+        chunk_size = max(1, chunk_size // self.group_size) * self.group_size
+        chunk = _read_full(source, chunk_size)
+        while True:
+            following = _read_full(source, chunk_size)
+            if not following:
+                # Маркер конца добавляется только к последней части
+                target.write(self.encode(chunk))
+                return
+            info = np.frombuffer(chunk, dtype=np.uint8).reshape(-1, self.code.n_i, self.width)
+            target.write(np.concatenate((info, self._control_slices(info)), axis=1).tobytes())
+            chunk = following
+
+    def decode_stream(self, source: BinaryIO, target: BinaryIO, chunk_size: int = 1 << 20) -> None:
+        """
+        Декодирование потока частями постоянного размера
+
+        Последняя группа придерживается до конца потока, чтобы снять маркер конца.
+
+        Args:
+            source: Источник закодированных байтов
+            target: Приёмник исходных байтов
+            chunk_size: Примерный размер читаемой части в байтах
+        """
+        self.corrected_words = 0
+        chunk_size = max(1, chunk_size // self.block_size) * self.block_size
+        pending = b''
+        while True:
+            chunk = _read_full(source, chunk_size)
+            if not chunk:
+                break
+            decoded = pending + self._decode_groups(chunk).tobytes()
+            target.write(decoded[:-self.group_size])
+            pending = decoded[-self.group_size:]
+        target.write(self._strip_padding(pending))
+
+
+def _read_full(source: BinaryIO, size: int) -> bytes:
+    """
+    Чтение ровно size байт (меньше — только в конце потока)
+
+    Канал или сокет может вернуть из read меньше запрошенного, а части
+    потока должны быть выровнены по группам, поэтому чтение повторяется.
+
+    Args:
+        source: Источник байтов (метод read)
+        size: Нужное число байтов
+
+    Returns:
+        bytes: Прочитанные байты
+    """
+    chunk = source.read(size)
+    if not chunk or len(chunk) == size:
+        return chunk
+    parts = [chunk]
+    received = len(chunk)
+    while received < size:
+        part = source.read(size - received)
+        if not part:
+            break
+        parts.append(part)
+        received += len(part)
+    return b''.join(parts)
+
+
+def _weight_chunk(low_rows: List[int], high_rows: List[int], n: int,
+                  start: int, stop: int) -> np.ndarray:
+    """
+    Подсчёт весов кодовых слов для диапазона индексов старшей части
+
+    Все комбинации младших строк строятся удвоением таблицы (один XOR на слово),
+    а старшая часть перебирается в порядке кода Грея: соседние индексы
+    отличаются одной строкой, поэтому переход к следующему блоку — один XOR.
+
+    Args:
+        low_rows: Упакованные строки порождающей матрицы для младших битов
+        high_rows: Упакованные строки для старших битов
+        n: Длина кодового слова
+        start: Первый индекс кода Грея старшей части
+        stop: Индекс, следующий за последним
+
+    Returns:
+        Массив длиной n + 1: число кодовых слов каждого веса
+    """
+    table = np.zeros(1, dtype=np.uint64)
+    for row in low_rows:
+        table = np.concatenate((table, table ^ np.uint64(row)))
+    shifted = np.empty_like(table)
+    counts = np.zeros(n + 1, dtype=np.int64)
+
+    # Кодовое слово старшей части для начального индекса
+    gray = start ^ (start >> 1)
+    prefix = 0
+    for bit, row in enumerate(high_rows):
+        if (gray >> bit) & 1:
+            prefix ^= row
+
+    last = 1 << len(high_rows)
+    for index in range(start, stop):
+        np.bitwise_xor(table, np.uint64(prefix), out=shifted)
+        counts += np.bincount(np.bitwise_count(shifted), minlength=n + 1)
+        # Следующее слово кода Грея отличается битом, равным числу младших нулей index + 1
+        step = index + 1
+        if step < last:
+            prefix ^= high_rows[(step & -step).bit_length() - 1]
+    return counts
+
+
+def weight_distribution(generator_matrix: np.ndarray, processes: Optional[int] = None,
+                        low_bits: int = 20) -> np.ndarray:
+    """
+    Весовой спектр линейного кода полным перебором всех 2^k кодовых слов
+
+    Перебор делится на диапазоны старших информационных битов, которые
+    обрабатываются в пуле процессов.
+
+    Args:
+        generator_matrix: Порождающая матрица размером k x n (n <= 64)
+        processes: Число процессов (по умолчанию — число ядер)
+        low_bits: Число младших битов, перебираемых векторно внутри одного блока
+
+    Returns:
+        Массив длиной n + 1: элемент w — число кодовых слов веса w
+    """
+    generator = np.asarray(generator_matrix) % 2
+    k, n = generator.shape
+    if n > 64:
+        raise ValueError("Длина кода не должна превышать 64 разряда")
+
+    # Строки упаковываются в целые числа, первый разряд — старший бит
+    rows = [int(''.join(str(bit) for bit in row), 2) for row in generator]
+    low = min(k, low_bits)
+    low_rows, high_rows = rows[:low], rows[low:]
+
+    total = 1 << len(high_rows)
+    workers = min(processes or os.cpu_count() or 1, total)
+    if workers == 1:
+        return _weight_chunk(low_rows, high_rows, n, 0, total)
+
+    # Несколько диапазонов на процесс для равномерной загрузки
+    parts = min(total, workers * 4)
+    bounds = [total * i // parts for i in range(parts + 1)]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(_weight_chunk, low_rows, high_rows, n, start, stop)
+                   for start, stop in zip(bounds[:-1], bounds[1:])]
+        return sum(future.result() for future in futures)
+
+
+def minimum_distance(generator_matrix: np.ndarray, processes: Optional[int] = None) -> int:
+    """
+    Минимальное кодовое расстояние линейного кода
+
+    Args:
+        generator_matrix: Порождающая матрица размером k x n
+        processes: Число процессов для перебора
+
+    Returns:
+        Минимальный вес ненулевого кодового слова (0, если строки матрицы зависимы)
+    """
+    distribution = weight_distribution(generator_matrix, processes)
+    if distribution[0] > 1:
+        return 0
+    weights = np.flatnonzero(distribution[1:])
+    return int(weights[0]) + 1 if weights.size else 0
+
+
+def _simulate_chunk(code, probability: float, blocks: int,
+                    seed: np.random.SeedSequence) -> Tuple[int, int]:
+    """
+    Передача одной пачки случайных слов через двоичный симметричный канал
+
+    Returns:
+        Кортеж (bit_errors, block_errors) — ошибочные информационные биты и блоки после декодирования
+    """
+    rng = np.random.default_rng(seed)
+    info = rng.integers(0, 2, (blocks, code.n_i), dtype=np.uint8)
+    noise = (rng.random((blocks, code.n)) < probability).astype(np.uint8)
+    corrected, _ = code.decode_batch(code.encode_batch(info) ^ noise)
+    wrong = corrected[:, :code.n_i] != info
+    return int(wrong.sum()), int(wrong.any(axis=1).sum())
+
+
+# Код, переданный процессу пула один раз при запуске (см. _init_simulation_worker)
+_worker_code = None
+
+
+def _init_simulation_worker(code) -> None:
+    """Инициализатор процесса пула: сохраняет код вместе с построенными таблицами декодера"""
+    global _worker_code
+    _worker_code = code
+
+
+def _simulate_worker_chunk(probability: float, blocks: int,
+                           seed: np.random.SeedSequence) -> Tuple[int, int]:
+    """Пачка _simulate_chunk в процессе пула — с кодом из инициализатора"""
+    return _simulate_chunk(_worker_code, probability, blocks, seed)
+
+
+def simulate_channel(code, probabilities: List[float], blocks: int = 1_000_000,
+                     batch_size: int = 100_000, seed: int = 0,
+                     processes: Optional[int] = None) -> List[Tuple[float, float, float]]:
+    """
+    Моделирование Монте-Карло: вероятность ошибки на бит (BER) и на блок (BLER)
+
+    Каждая вероятность моделируется пачками по batch_size слов; у каждой пачки
+    своё зерно из SeedSequence, поэтому результат не зависит от числа процессов.
+
+    Args:
+        code: Систематический код с n, n_i, encode_batch и decode_batch
+              (GroupCode, CyclicCode с заданной длиной, BCHCode)
+        probabilities: Вероятности искажения бита в канале
+        blocks: Число передаваемых слов для каждой вероятности
+        batch_size: Размер пачки слов
+        seed: Зерно генератора
+        processes: Число процессов (по умолчанию — число ядер)
+
+    Returns:
+        Список кортежей (p, ber, bler) в порядке probabilities
+    """
+    # Таблицы декодера строятся один раз до передачи кода в процессы;
+    # код пересылается каждому процессу один раз, в задачах — только параметры пачек
+    code.decode_batch(np.zeros((1, code.n), dtype=np.uint8))
+
+    sizes = [batch_size] * (blocks // batch_size)
+    if blocks % batch_size:
+        sizes.append(blocks % batch_size)
+    seeds = np.random.SeedSequence(seed).spawn(len(probabilities) * len(sizes))
+    jobs = [(p, size, seeds[i * len(sizes) + j])
+            for i, p in enumerate(probabilities) for j, size in enumerate(sizes)]
+
+    workers = min(processes or os.cpu_count() or 1, len(jobs))
+    if workers == 1:
+        counts = [_simulate_chunk(code, *job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_simulation_worker,
+                                 initargs=(code,)) as pool:
+            futures = [pool.submit(_simulate_worker_chunk, *job) for job in jobs]
+            counts = [future.result() for future in futures]
+
+    results = []
+    for i, p in enumerate(probabilities):
+        part = counts[i * len(sizes):(i + 1) * len(sizes)]
+        bit_errors = sum(bits for bits, _ in part)
+        block_errors = sum(errors for _, errors in part)
+        results.append((p, bit_errors / (blocks * code.n_i), block_errors / blocks))
+    return results
+
+
 def task1() -> None:
     """
     Задание №1: Работа с групповым кодом (9,5)
@@ -387,6 +1405,18 @@ def task1() -> None:
             print(f"    Код с ошибками: {error_code2}")
             print(f"    Синдром: {syndrome2}")
 
+    # Пункт 4: Проверка кодового расстояния полным перебором
+    print("\n--- 4. КОДОВОЕ РАССТОЯНИЕ ---")
+    distribution = weight_distribution(group_code.generator_matrix)
+    d_min = minimum_distance(group_code.generator_matrix)
+    print("Весовой спектр кода:")
+    for weight, count in enumerate(distribution):
+        if count:
+            print(f"  Вес {weight}: {count} кодовых слов")
+    print(f"Минимальное кодовое расстояние: d0 = {d_min}")
+    print(f"  Обнаруживает: до {max(d_min - 1, 0)} ошибок")
+    print(f"  Исправляет: до {max((d_min - 1) // 2, 0)} ошибок")
+
 
 def task2() -> Tuple[int, int]:
     """
@@ -434,15 +1464,35 @@ def task2() -> Tuple[int, int]:
         k = 5
         r = 10
     
+    print(f"\nГраница Хэмминга допускает код не короче ({n}, {k}), r = {r}")
+    
+    # Граница Хэмминга — только необходимое условие, поэтому строим реальный
+    # код БЧХ с t = 2 над GF(2^4) и проверяем его расстояние перебором
+    bch = BCHCode(4, 2)
+    d_min = minimum_distance(bch.group_code.generator_matrix)
+    n, k = bch.n, bch.k
+    
     print(f"\nРЕЗУЛЬТАТ:")
-    print(f"  Выбран код с параметрами: ({n}, {k})")
+    print(f"  Выбран код БЧХ с параметрами: ({n}, {k})")
     print(f"  Информационных битов: k = {k}")
-    print(f"  Контрольных битов: r = {r}") 
+    print(f"  Контрольных битов: r = {n - k}") 
     print(f"  Общая длина кода: n = {n}")
-    print(f"  Минимальное кодовое расстояние: d0 >= 5")
+    print(f"  Минимальное кодовое расстояние: d0 = {d_min}")
     print(f"  Количество кодовых комбинаций: 2^{k} = {2**k} >= {num_combinations}")
-    print(f"  Обнаруживает: до 4 ошибок")
-    print(f"  Исправляет: до 2 ошибок")
+    print(f"  Обнаруживает: до {d_min - 1} ошибок")
+    print(f"  Исправляет: до {(d_min - 1) // 2} ошибок")
+    
+    # Проверка исправления двойной ошибки
+    info_part = [int(bit) for bit in format(num_combinations - 1, f"0{k}b")]
+    code_word = bch.encode(info_part)
+    received = code_word.copy()
+    received[2] ^= 1
+    received[9] ^= 1
+    corrected, errors = bch.decode(received)
+    print(f"\nПроверка на комбинации {info_part}:")
+    print(f"  Кодовое слово: {code_word}")
+    print(f"  Ошибки в разрядах 3 и 10: {received}")
+    print(f"  Исправлено ошибок: {errors}, результат {'совпадает' if corrected == code_word else 'не совпадает'}")
     
     return n, k
 
@@ -468,8 +1518,8 @@ def task3() -> None:
     # Принятый код для проверки
     received_code = [1, 0, 1, 0, 1, 1, 1, 0, 1, 0, 0, 1, 0, 0]
     
-    # Создание циклического кода
-    cyclic_code = CyclicCode(generator_poly)
+    # Создание циклического кода длины принятой комбинации
+    cyclic_code = CyclicCode(generator_poly, n=len(received_code))
     
     # Пункт 1: Формирование избыточного циклического кода
     print("\n--- 1. ФОРМИРОВАНИЕ ИЗБЫТОЧНОГО КОДА ---")
@@ -502,29 +1552,72 @@ def task3() -> None:
         print("\n--- ПРИМЕРЫ ДВУКРАТНЫХ ОШИБОК ---")
         print(f"Поиск двукратных ошибок с остатком: {remainder}")
         
-        examples_found = 0
         n = len(received_code)
         
-        # Перебор пар позиций для двукратных ошибок
-        for i in range(n):
-            for j in range(i + 1, n):
-                # Создание кода с ошибками в позициях i и j
-                test_code = received_code.copy()
-                test_code[i] ^= 1
-                test_code[j] ^= 1
-                
-                # Проверка остатка
-                _, test_remainder = cyclic_code.decode(test_code)
-                
-                if test_remainder == remainder:
-                    examples_found += 1
-                    print(f"  Пример {examples_found}: ошибки в разрядах {i + 1} и {j + 1}")
-                    print(f"    Ошибочный код: {test_code}")
-                    
-                    if examples_found >= 2:  # Ограничим количество примеров
-                        break
-            if examples_found >= 2:
-                break
+        # Все пары позиций для двукратных ошибок — одной матрицей ошибок
+        first, second = np.triu_indices(n, k=1)
+        errors = np.zeros((first.size, n), dtype=np.uint8)
+        errors[np.arange(first.size), first] = 1
+        errors[np.arange(first.size), second] = 1
+        test_codes = np.array(received_code, dtype=np.uint8) ^ errors
+        
+        # Один векторный проход вычисления остатков для всех пар
+        test_remainders = cyclic_code.syndrome_batch(test_codes)
+        matches = np.flatnonzero((test_remainders == np.array(remainder)).all(axis=1))
+        
+        for example, index in enumerate(matches[:2], 1):  # Ограничим количество примеров
+            print(f"  Пример {example}: ошибки в разрядах {first[index] + 1} и {second[index] + 1}")
+            print(f"    Ошибочный код: {test_codes[index].tolist()}")
+        if matches.size == 0:
+            print("  Двукратных ошибок с таким остатком нет")
+
+
+def task4() -> None:
+    """
+    Задание №4: Моделирование передачи по двоичному симметричному каналу
+    - Сравнение вероятности ошибки на бит и на блок для построенных кодов
+    """
+    print("\n" + "="*60)
+    print("ЗАДАНИЕ №4: МОДЕЛИРОВАНИЕ КАНАЛА С ШУМОМ")
+    print("="*60)
+    
+    codes = {
+        "Групповой (9,5)": GroupCode([[1, 1, 1, 1], [1, 1, 1, 0], [1, 1, 0, 1],
+                                      [1, 0, 1, 1], [0, 1, 1, 1]], verbose=False),
+        "Циклический (14,9)": CyclicCode([1, 1, 0, 1, 1, 1], n=14),
+        "БЧХ (15,7)": BCHCode(4, 2, verbose=False),
+    }
+    probabilities = [0.001, 0.01, 0.05, 0.1]
+    
+    for name, code in codes.items():
+        print(f"\n{name}:")
+        print(f"  {'p':>8} {'BER':>12} {'BLER':>12}")
+        for p, ber, bler in simulate_channel(code, probabilities, blocks=50_000, batch_size=10_000):
+            print(f"  {p:>8} {ber:>12.3e} {bler:>12.3e}")
+
+
+def task5() -> None:
+    """
+    Задание №5: Защита потока байтов от пакетов ошибок перемежением
+    """
+    print("\n" + "="*60)
+    print("ЗАДАНИЕ №5: ПЕРЕМЕЖЕНИЕ И ПАКЕТЫ ОШИБОК")
+    print("="*60)
+    
+    codec = InterleavedCodec(BCHCode(4, 2, verbose=False), depth=64)
+    message = "Помехоустойчивые коды: проверка на пакете ошибок".encode('utf-8')
+    encoded = bytearray(codec.encode(message))
+    
+    # Пакет из 2 * depth подряд искажённых бит: каждое слово получает не более двух ошибок
+    burst_start = 5
+    for i in range(burst_start, burst_start + 2 * codec.width):
+        encoded[i] ^= 0xFF
+    
+    decoded = codec.decode(bytes(encoded))
+    print(f"Исходные данные: {len(message)} байт, закодированные: {len(encoded)} байт")
+    print(f"Искажено подряд: {2 * codec.depth} бит")
+    print(f"Исправлено слов: {codec.corrected_words}")
+    print(f"Данные восстановлены: {'да' if decoded == message else 'нет'}")
 
 
 def main() -> None:
@@ -540,6 +1633,8 @@ def main() -> None:
         task1()  # Групповой код (9,5)
         n, k = task2()  # Создание кода для 18 комбинаций
         task3()  # Циклический код
+        task4()  # Моделирование канала
+        task5()  # Перемежение
         
         print("\n" + "=" * 60)
         print("РЕЗЮМЕ ВЫПОЛНЕННОЙ РАБОТЫ:")
@@ -548,6 +1643,8 @@ def main() -> None:
         print("2. Создан код с параметрами ({}, {}) для 18 комбинаций".format(n, k))
         print("3. Реализован циклический код с заданным образующим многочленом")
         print("4. Все коды поддерживают обнаружение и исправление ошибок")
+        print("5. Вероятности ошибок кодов оценены моделированием канала")
+        print("6. Поток байтов защищён от пакетов ошибок перемежением")
         print("\nКод готов к демонстрации преподавателю!")
         
     except Exception as e:
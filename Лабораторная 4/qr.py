@@ -68,6 +68,17 @@ Byte (8-bit) — любой байт (включая UTF-8)
 """
 
 
+import os
+import re
+import tempfile
+import time
+import zipfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from io import BytesIO
+from itertools import islice
+
 import qrcode
 from barcode import Code128
 from barcode.writer import ImageWriter
@@ -89,17 +100,101 @@ def generate_qr(data: str, filename: str):
 
     Данные → побитовое кодирование → добавление ECC (Reed–Solomon) → размещение в матрице с поисковыми паттернами
     """
+    with open(filename, 'wb') as f:
+        f.write(qr_png(data))
+    print(f"QR-код сохранён: {filename}")
+
+def _make_qr(data: str, mask_pattern=None):
     qr = qrcode.QRCode(
         version=1,                # размер (1–40), 1 = 21x21
         error_correction=qrcode.constants.ERROR_CORRECT_H,  # 30% восстановление
         box_size=10,
         border=4,
+        mask_pattern=mask_pattern,
     )
     qr.add_data(data)
     qr.make(fit=True)
-    img = qr.make_image(fill_color="black", back_color="white")
-    img.save(filename)
-    print(f"QR-код сохранён: {filename}")
+    return qr
+
+def qr_png(data: str) -> bytes:
+    """QR-код в виде PNG-байтов, без записи на диск."""
+    img = _make_qr(data).make_image(fill_color="black", back_color="white")
+    buffer = BytesIO()
+    img.save(buffer, format='PNG')
+    return buffer.getvalue()
+
+# --- Вывод матрицы модулей без PIL ---
+# Матрица (с тихой зоной border) берётся у qrcode напрямую и сразу пишется в
+# SVG, PBM или упакованный битовый массив — без make_image и PNG-сжатия.
+
+def qr_matrix(data: str, mask_pattern=None):
+    """Матрица модулей QR-кода: список строк из True (чёрный) / False, включая рамку.
+
+    Основное время уходит на выбор лучшей из 8 масок; фиксированный
+    mask_pattern (0–7) убирает этот перебор, код остаётся корректным.
+    """
+    return _make_qr(data, mask_pattern).get_matrix()
+
+def matrix_to_svg(matrix, scale=10) -> str:
+    """SVG одним контуром: серия чёрных модулей строки — отрезок толщиной в модуль.
+
+    Отрезки идут по средним линиям строк через относительные перемещения
+    «m dx dy h n» от конца предыдущего, поэтому на серию уходит несколько символов.
+    """
+    size = len(matrix)
+    parts = ["M0 .5"]
+    cx = cy = 0
+    for y, row in enumerate(matrix):
+        x = 0
+        while x < size:
+            if row[x]:
+                start = x
+                while x < size and row[x]:
+                    x += 1
+                parts.append(f"m{start - cx} {y - cy}h{x - start}")
+                cx, cy = x, y
+            else:
+                x += 1
+    return (f'<svg xmlns="http://www.w3.org/2000/svg" width="{size * scale}" height="{size * scale}" '
+            f'viewBox="0 0 {size} {size}" shape-rendering="crispEdges">'
+            f'<rect width="{size}" height="{size}" fill="#fff"/>'
+            f'<path stroke="#000" d="{"".join(parts)}"/></svg>')
+
+def matrix_to_raster(matrix, scale=10):
+    """Растр uint8 (1 — чёрный): каждый модуль растягивается в scale x scale точек повтором NumPy."""
+    import numpy as np  # только для растров; в зависимостях лабораторной его нет
+    return np.asarray(matrix, dtype=np.uint8).repeat(scale, axis=0).repeat(scale, axis=1)
+
+def matrix_to_bitmap(matrix, scale=1):
+    """Упакованный битовый массив: (байты, ширина, высота).
+
+    Строки по 8 точек в байте, старший бит — левая точка, строка дополнена
+    до целого байта (как тело PBM). При scale = 1 упаковка идёт без NumPy.
+    """
+    if scale != 1:
+        import numpy as np
+        raster = matrix_to_raster(matrix, scale)
+        return np.packbits(raster, axis=1).tobytes(), raster.shape[1], raster.shape[0]
+    width = len(matrix[0])
+    row_bytes = (width + 7) // 8
+    out = bytearray()
+    for row in matrix:
+        bits = 0
+        for cell in row:
+            bits = (bits << 1) | bool(cell)
+        out += (bits << (8 * row_bytes - width)).to_bytes(row_bytes, 'big')
+    return bytes(out), width, len(matrix)
+
+def matrix_to_pbm(matrix, scale=1) -> bytes:
+    """Двоичный PBM (P4): заголовок и упакованные строки, 1 — чёрный."""
+    bitmap, width, height = matrix_to_bitmap(matrix, scale)
+    return f"P4\n{width} {height}\n".encode('ascii') + bitmap
+
+def qr_svg(data: str, mask_pattern=None) -> bytes:
+    return matrix_to_svg(qr_matrix(data, mask_pattern)).encode('ascii')
+
+def qr_pbm(data: str, mask_pattern=None) -> bytes:
+    return matrix_to_pbm(qr_matrix(data, mask_pattern))
 
 # Генерация штрих-кода (Code 128)
 def generate_barcode(data: str, filename: str):
@@ -111,11 +206,113 @@ def generate_barcode(data: str, filename: str):
     Каждый символ → последовательность из 6 полос (3 чёрных + 3 белых), закодированных в ширине
     '''
 
-    # Code128 поддерживает буквы, цифры, спецсимволы
-    barcode = Code128(data, writer=ImageWriter())
-    barcode.save(filename.replace('.png', ''))  
+    with open(filename, 'wb') as f:
+        f.write(barcode_png(data))
     print(f"Штрих-код сохранён: {filename}")
 
+def barcode_png(data: str) -> bytes:
+    """Штрих-код Code128 в виде PNG-байтов, без записи на диск."""
+    # Code128 поддерживает буквы, цифры, спецсимволы
+    buffer = BytesIO()
+    Code128(data, writer=ImageWriter()).write(buffer)
+    return buffer.getvalue()
+
+# --- Пакетная генерация ---
+
+# Маска для пакетного SVG/PBM: перебор 8 масок занимает почти всё время
+# построения кода, а с фиксированной маской код остаётся корректным
+BATCH_MASK_PATTERN = 0
+
+RENDERERS = {
+    'qr': qr_png,
+    'qr-svg': partial(qr_svg, mask_pattern=BATCH_MASK_PATTERN),
+    'qr-pbm': partial(qr_pbm, mask_pattern=BATCH_MASK_PATTERN),
+    'barcode': barcode_png,
+}
+EXTENSIONS = {'qr': 'png', 'qr-svg': 'svg', 'qr-pbm': 'pbm', 'barcode': 'png'}
+
+def _render_chunk(kind, payloads):
+    render = RENDERERS[kind]
+    return [render(data) for data in payloads]
+
+def render_batch(payloads, kind='qr', processes=None, chunksize=64, as_io=False):
+    """Байты кода для каждой строки из payloads, в исходном порядке.
+
+    kind — 'qr' (PNG), 'qr-svg', 'qr-pbm' или 'barcode' (PNG).
+
+    Коды рисуются в пуле процессов порциями по chunksize (None — по числу
+    ядер, 1 — в текущем процессе). payloads читается лениво и в работе
+    держится не больше двух порций на процесс, поэтому память не растёт с
+    длиной тиража. При as_io=True вместо bytes выдаются BytesIO.
+    """
+    wrap = BytesIO if as_io else bytes
+    payloads = iter(payloads)
+    if processes == 1:
+        for data in payloads:
+            yield wrap(RENDERERS[kind](data))
+        return
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        pending = deque()
+        limit = 2 * (processes or os.cpu_count() or 1)
+        while True:
+            while len(pending) < limit:
+                chunk = list(islice(payloads, chunksize))
+                if not chunk:
+                    break
+                pending.append(pool.submit(_render_chunk, kind, chunk))
+            if not pending:
+                return
+            for png in pending.popleft().result():
+                yield wrap(png)
+
+# Разделители путей и NUL в строке кода заменяются, чтобы имя не выходило из каталога
+_UNSAFE_NAME_CHARS = re.compile(r'[/\\\x00]')
+
+def _batch_name(name_format, index, data):
+    """Имя файла пачки: data без разделителей путей, итог — путь внутри target."""
+    data = _UNSAFE_NAME_CHARS.sub('_', str(data))
+    if data in ('', '.', '..'):
+        data = '_'
+    name = name_format.format(index=index, data=data)
+    parts = name.replace('\\', '/').split('/')
+    if os.path.isabs(name) or any(part in ('', '.', '..') for part in parts):
+        raise ValueError(f"Имя файла выходит за пределы каталога: {name!r}")
+    return name
+
+def save_batch(payloads, target, kind='qr', processes=None, chunksize=64, name_format=None):
+    """Рисует коды и складывает их в каталог или в zip-архив (если target оканчивается на .zip).
+
+    Имя файла строится по name_format из номера (index) и строки (data);
+    по умолчанию — номер из шести цифр и расширение формата kind. В data
+    разделители путей заменяются на '_', а имя, выходящее за target, отклоняется.
+    Возвращает число записанных кодов.
+    """
+    if name_format is None:
+        name_format = '{index:06d}.' + EXTENSIONS[kind]
+    # Имена копятся по мере чтения payloads и снимаются в том же порядке, в каком приходят картинки
+    names = deque()
+
+    def source():
+        for index, data in enumerate(payloads):
+            names.append(_batch_name(name_format, index, data))
+            yield data
+
+    images = render_batch(source(), kind, processes, chunksize)
+    count = 0
+    if str(target).endswith('.zip'):
+        # PNG уже сжат — в архив без повторного сжатия
+        with zipfile.ZipFile(target, 'w', compression=zipfile.ZIP_STORED) as archive:
+            for png in images:
+                archive.writestr(names.popleft(), png)
+                count += 1
+    else:
+        os.makedirs(target, exist_ok=True)
+        for png in images:
+            with open(os.path.join(target, names.popleft()), 'wb') as f:
+                f.write(png)
+            count += 1
+    return count
+
 # Основной запуск
 if __name__ == "__main__":
     DATA_QR = "Меня зовут Максим! Hi"  
@@ -125,6 +322,24 @@ if __name__ == "__main__":
     generate_qr(DATA_QR, "qr_code.png")
     generate_barcode(DATA_BARCODE, "barcode.png")
 
+    # Пакетная генерация: тираж этикеток в zip-архив
+    with tempfile.TemporaryDirectory() as folder:
+        start = time.perf_counter()
+        count = save_batch((f"LABEL-{i:06d}" for i in range(500)), os.path.join(folder, "labels.zip"))
+        print(f"Пакет: {count} QR-кодов в zip за {time.perf_counter() - start:.2f} с")
+
+    # Вывод матрицы напрямую: SVG и PBM против PNG через PIL, полный путь от строки до байтов
+    mask = BATCH_MASK_PATTERN
+    for name, render in [("PNG", lambda: qr_png(DATA_QR)),
+                         ("SVG", lambda: qr_svg(DATA_QR)),
+                         ("SVG m0", lambda: qr_svg(DATA_QR, mask)),
+                         ("PBM m0", lambda: qr_pbm(DATA_QR, mask)),
+                         ("PBM x10", lambda: matrix_to_pbm(qr_matrix(DATA_QR, mask), scale=10))]:
+        start = time.perf_counter()
+        for _ in range(100):
+            payload = render()
+        print(f"{name:<8} {len(payload):>6} байт, {(time.perf_counter() - start) * 10:.3f} мс на код")
+
     # Показать изображения
     try:
         Image.open("qr_code.png").show()
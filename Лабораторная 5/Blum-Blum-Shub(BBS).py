@@ -1,3 +1,9 @@
+import math
+import secrets
+
+from sympy import isprime
+
+
 def bbs_generator(seed, p, q, num_bits):
     M = p * q
     x = (seed * seed) % M
@@ -7,10 +13,101 @@ def bbs_generator(seed, p, q, num_bits):
         bits.append(x & 1)  # младший бит
     return bits
 
-# Выбор безопасных простых p и q: p ≡ q ≡ 3 (mod 4)
-p = 7  # 7 % 4 = 3
-q = 11 # 11 % 4 = 3
-seed = 5  # должен быть взаимно прост с M = p*q
 
-bits = bbs_generator(seed, p, q, 20)
-print("Сгенерированные биты:", bits)
\ No newline at end of file
+def generate_blum_prime(bits):
+    """Случайное простое число Блюма заданной битности: p ≡ 3 (mod 4)."""
+    while True:
+        # Старший бит — нужная длина, два младших — остаток 3 по модулю 4
+        candidate = secrets.randbits(bits) | (1 << (bits - 1)) | 3
+        if isprime(candidate):
+            return candidate
+
+
+class BBS:
+    """Генератор Блюм–Блюма–Шуба с выдачей байтов.
+
+    За одно возведение в квадрат берётся floor(log2(log2 M)) младших бит
+    (столько можно извлекать, сохраняя стойкость), биты упаковываются в байты
+    пачками. i-е состояние доступно напрямую: x_i = x0^(2^i mod λ(M)) mod M,
+    где λ(M) = НОК(p - 1, q - 1), поэтому генератор можно переставить в любую
+    позицию без прохода по предыдущим.
+    """
+
+    # Число возведений в квадрат за одну пачку; пачка даёт целое число байтов
+    BATCH = 512
+
+    def __init__(self, bits=2048, seed=None, p=None, q=None):
+        if p is None or q is None:
+            p = generate_blum_prime(bits // 2)
+            q = generate_blum_prime(bits - bits // 2)
+            while q == p:
+                q = generate_blum_prime(bits - bits // 2)
+        if p % 4 != 3 or q % 4 != 3 or p == q:
+            raise ValueError("p и q должны быть различными простыми ≡ 3 (mod 4)")
+
+        self.M = p * q
+        self._lambda = math.lcm(p - 1, q - 1)
+        if seed is None:
+            seed = secrets.randbelow(self.M - 2) + 2
+            while math.gcd(seed, self.M) != 1:
+                seed = secrets.randbelow(self.M - 2) + 2
+        if math.gcd(seed, self.M) != 1:
+            raise ValueError("seed должен быть взаимно прост с M = p*q")
+
+        self.x0 = (seed * seed) % self.M
+        # floor(log2(log2 M)): log2 M лежит в [L - 1, L), где L — битовая длина M
+        self.bits_per_step = max(1, (self.M.bit_length() - 1).bit_length() - 1)
+        self._mask = (1 << self.bits_per_step) - 1
+        self.seek(0)
+
+    def state_at(self, i):
+        """Состояние x_i без вычисления предыдущих: x0^(2^i mod λ) mod M."""
+        return pow(self.x0, pow(2, i, self._lambda), self.M)
+
+    def seek(self, i):
+        """Переход к i-му возведению в квадрат: следующий вывод начнётся с x_(i+1)."""
+        self.index = i
+        self.x = self.state_at(i)
+        self._pending = b''
+
+    def output_at(self, i):
+        """Биты, которые дало i-е (с единицы) возведение в квадрат."""
+        return self.state_at(i) & self._mask
+
+    def _batch(self):
+        """Одна пачка BATCH возведений в квадрат, упакованная в байты."""
+        x, M, mask, k = self.x, self.M, self._mask, self.bits_per_step
+        acc = 0
+        for _ in range(self.BATCH):
+            x = x * x % M
+            acc = (acc << k) | (x & mask)
+        self.x = x
+        self.index += self.BATCH
+        return acc.to_bytes(self.BATCH * k // 8, 'big')
+
+    def read(self, n):
+        """Возвращает n случайных байтов."""
+        out = bytearray(self._pending)
+        while len(out) < n:
+            out += self._batch()
+        self._pending = bytes(out[n:])
+        return bytes(out[:n])
+
+    def bits(self, n):
+        """n бит в виде байтов (старший бит первого байта — первый бит)."""
+        return self.read((n + 7) // 8)
+
+
+if __name__ == "__main__":
+    # Выбор безопасных простых p и q: p ≡ q ≡ 3 (mod 4)
+    p = 7  # 7 % 4 = 3
+    q = 11 # 11 % 4 = 3
+    seed = 5  # должен быть взаимно прост с M = p*q
+
+    bits = bbs_generator(seed, p, q, 20)
+    print("Сгенерированные биты:", bits)
+
+    # Генератор с большими простыми Блюма
+    rng = BBS(bits=1024)
+    print(f"Бит за одно возведение в квадрат: {rng.bits_per_step}")
+    print("Случайные байты:", rng.read(32).hex())
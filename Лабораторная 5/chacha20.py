@@ -5,10 +5,14 @@ ChaCha20 — это потоковый шифр, который можно ис
 '''
 
 
+import multiprocessing
 import os
+import struct
+import threading
 import time
+from concurrent.futures import ProcessPoolExecutor
 import hashlib
-import matplotlib.pyplot as plt
+import numpy as np
 
 
 def rotl32(v, n):
@@ -82,16 +86,140 @@ def chacha20_block(key, counter, nonce):
     # После всех раундов делается финальное сложение
     out = [(x[i] + state[i]) & 0xFFFFFFFF for i in range(16)]
 
-    # Результат — 16 чисел по 4 байта. Их нужно превратить в байтовую строку:
-    block = b''
-    for word in out:
-        # Little-endian: младший байт идёт первым. Это часть стандарта ChaCha20
-        block += word.to_bytes(4, 'little')
-    return block
+    # Результат — 16 чисел по 4 байта. Их нужно превратить в байтовую строку.
+    # Little-endian: младший байт идёт первым. Это часть стандарта ChaCha20
+    return struct.pack('<16I', *out)
+
+# Константа "expand 32-byte k" для векторной версии
+CHACHA20_CONSTANTS = np.array([0x61707865, 0x3320646e, 0x79622d32, 0x6b206574], dtype=np.uint32)
+
+
+def _rotl_rows(v, n, tmp):
+    """Циклический сдвиг строки uint32 на месте (tmp — временный буфер той же формы)."""
+    np.right_shift(v, 32 - n, out=tmp)
+    np.left_shift(v, n, out=v)
+    v |= tmp
+
+
+def _quarter_round(x, a, b, c, d, tmp):
+    """Quarter-round над строками массива: каждая строка — одно слово во всех блоках."""
+    x[a] += x[b]; x[d] ^= x[a]; _rotl_rows(x[d], 16, tmp)
+    x[c] += x[d]; x[b] ^= x[c]; _rotl_rows(x[b], 12, tmp)
+    x[a] += x[b]; x[d] ^= x[a]; _rotl_rows(x[d], 8, tmp)
+    x[c] += x[d]; x[b] ^= x[c]; _rotl_rows(x[b], 7, tmp)
+
+
+def chacha20_blocks(key, counter, nonce, count):
+    """Генерирует count подряд идущих блоков ChaCha20 за один вызов.
+
+    Состояние хранится как массив 16 x count слов uint32: счётчик — это
+    отдельная «полоса» для каждого блока, а все раунды выполняются сразу для
+    всех блоков операциями NumPy (сложение по модулю 2^32 — переполнение uint32,
+    сдвиг — пара сдвигов и OR). Результат совпадает с конкатенацией
+    chacha20_block(key, counter + i, nonce) для i = 0..count-1.
+    """
+    state = np.empty((16, count), dtype=np.uint32)
+    state[0:4] = CHACHA20_CONSTANTS[:, None]
+    state[4:12] = np.array(key, dtype=np.uint32)[:, None]
+    # Счётчик 32-битный и переполняется так же, как в ChaCha20RNG
+    state[12] = (np.arange(count, dtype=np.uint64) + counter) & 0xFFFFFFFF
+    state[13:16] = np.array(nonce, dtype=np.uint32)[:, None]
+
+    x = state.copy()
+    tmp = np.empty(count, dtype=np.uint32)
+    for _ in range(10):
+        # Колонки
+        _quarter_round(x, 0, 4, 8, 12, tmp)
+        _quarter_round(x, 1, 5, 9, 13, tmp)
+        _quarter_round(x, 2, 6, 10, 14, tmp)
+        _quarter_round(x, 3, 7, 11, 15, tmp)
+        # Диагонали
+        _quarter_round(x, 0, 5, 10, 15, tmp)
+        _quarter_round(x, 1, 6, 11, 12, tmp)
+        _quarter_round(x, 2, 7, 8, 13, tmp)
+        _quarter_round(x, 3, 4, 9, 14, tmp)
+
+    x += state
+    # Блок за блоком, слова little-endian
+    return x.T.astype('<u4', copy=False).tobytes()
+
+
+# Сколько блоков считать за один векторный проход: 1 МБ держится в кэше лучше, чем весь буфер
+KEYSTREAM_BATCH_BLOCKS = 16384
+
+
+def chacha20_keystream(key, counter, nonce, nbytes):
+    """Возвращает nbytes байт ключевого потока, начиная с блока counter."""
+    out = bytearray(nbytes)
+    view = memoryview(out)
+    blocks = (nbytes + 63) // 64
+    for start in range(0, blocks, KEYSTREAM_BATCH_BLOCKS):
+        count = min(KEYSTREAM_BATCH_BLOCKS, blocks - start)
+        chunk = chacha20_blocks(key, (counter + start) & 0xFFFFFFFF, nonce, count)
+        offset = start * 64
+        view[offset:offset + len(chunk)] = chunk[:nbytes - offset]
+    return bytes(out)
+
+
+# Меньше этого числа блоков (64 КБ) на процесс пересылка задачи не окупается
+PARALLEL_MIN_BLOCKS = 1024
+
+# Пулы процессов по числу рабочих: создаются при первом параллельном вызове и
+# переиспользуются, чтобы не платить за запуск процессов на каждую порцию
+_EXECUTORS = {}
+_EXECUTORS_LOCK = threading.Lock()
+
+
+def _shared_executor(processes):
+    with _EXECUTORS_LOCK:
+        pool = _EXECUTORS.get(processes)
+        if pool is None:
+            pool = ProcessPoolExecutor(max_workers=processes,
+                                       mp_context=multiprocessing.get_context('spawn'))
+            _EXECUTORS[processes] = pool
+        return pool
+
+
+def shutdown_executors():
+    """Останавливает общие пулы процессов параллельного шифрования."""
+    with _EXECUTORS_LOCK:
+        pools = list(_EXECUTORS.values())
+        _EXECUTORS.clear()
+    for pool in pools:
+        pool.shutdown()
+
+
+def parallel_keystream(key, counter, nonce, nbytes, processes=None):
+    """Ключевой поток, посчитанный в пуле процессов по диапазонам счётчика.
+
+    Блоки ChaCha20 независимы при известном счётчике, поэтому каждый процесс
+    получает свой непрерывный диапазон блоков, а результат собирается по
+    смещениям. Процессов берётся столько, чтобы на каждый пришлось не меньше
+    PARALLEL_MIN_BLOCKS блоков. Вывод побайтно совпадает с chacha20_keystream.
+    """
+    processes = processes or os.cpu_count() or 1
+    blocks = (nbytes + 63) // 64
+    workers = min(processes, -(-blocks // PARALLEL_MIN_BLOCKS))
+    if workers <= 1:
+        return chacha20_keystream(key, counter, nonce, nbytes)
+
+    bounds = [blocks * i // workers for i in range(workers + 1)]
+    out = bytearray(nbytes)
+    pool = _shared_executor(processes)
+    parts = []
+    for start, stop in zip(bounds[:-1], bounds[1:]):
+        offset = start * 64
+        size = min(stop * 64, nbytes) - offset
+        parts.append((offset, size, pool.submit(
+            chacha20_keystream, key, (counter + start) & 0xFFFFFFFF, nonce, size)))
+    for offset, size, future in parts:
+        out[offset:offset + size] = future.result()
+    return bytes(out)
+
 
 class ChaCha20RNG:
     '''Использование алгоритма, чтобы можно было генерировать не только по 64 байта, а например 4'''
-    def __init__(self, key: bytes, nonce: bytes = b'\x00' * 12):
+    def __init__(self, key: bytes, nonce: bytes = b'\x00' * 12, processes: int = 1):
         if len(key) != 32:
             raise ValueError("Key must be 32 bytes (256 bits)")
         if len(nonce) != 12:
@@ -99,36 +227,248 @@ class ChaCha20RNG:
         self.key = [int.from_bytes(key[i:i+4], 'little') for i in range(0, 32, 4)]
         self.nonce = [int.from_bytes(nonce[i:i+4], 'little') for i in range(0, 12, 4)]
         self.counter = 0
-        self.buffer = b''
-        self.pos = 0
+        # При processes != 1 пополнения и большие запросы readinto считаются в
+        # пуле процессов, а буфер растёт, чтобы каждому процессу досталось REFILL_BLOCKS блоков
+        self.processes = processes
+        workers = 1 if processes == 1 else processes or os.cpu_count() or 1
+        self.refill_blocks = self.REFILL_BLOCKS * workers
+        # Внутренний буфер выделяется один раз и перезаполняется сразу refill_blocks блоками
+        self.buffer = bytearray(self.refill_blocks * 64)
+        self._view = memoryview(self.buffer)
+        self.pos = len(self.buffer)
+        self._words = None
+
+    # Сколько блоков генерировать за одно пополнение буфера на процесс (64 КБ)
+    REFILL_BLOCKS = 1024
 
     def _refill(self):
-        block = chacha20_block(self.key, self.counter, self.nonce)
-        self.buffer = block
+        if self.processes == 1:
+            self.buffer[:] = chacha20_blocks(self.key, self.counter, self.nonce, self.refill_blocks)
+        else:
+            self.buffer[:] = parallel_keystream(self.key, self.counter, self.nonce,
+                                                len(self.buffer), self.processes)
+        # Слова для rand32 разбираются лениво: чистому readinto они не нужны
+        self._words = None
         self.pos = 0
-        self.counter = (self.counter + 1) & 0xFFFFFFFF
+        self.counter = (self.counter + self.refill_blocks) & 0xFFFFFFFF
+
+    def readinto(self, buffer) -> int:
+        """Заполняет переданный bytearray/memoryview случайными байтами без промежуточных копий."""
+        view = memoryview(buffer).cast('B')
+        n = len(view)
+        filled = 0
+
+        # Сначала остаток внутреннего буфера
+        take = min(n, len(self.buffer) - self.pos)
+        view[:take] = self._view[self.pos:self.pos + take]
+        self.pos += take
+        filled += take
+
+        # Запросы не меньше одного пополнения пишутся прямо в буфер вызывающего;
+        # мелкие дешевле обслужить из внутреннего буфера, генерируемого пачкой
+        blocks = (n - filled) // 64
+        if blocks >= self.refill_blocks:
+            if self.processes != 1:
+                size = blocks * 64
+                view[filled:filled + size] = parallel_keystream(
+                    self.key, self.counter, self.nonce, size, self.processes)
+                self.counter = (self.counter + blocks) & 0xFFFFFFFF
+                filled += size
+                blocks = 0
+            while blocks:
+                count = min(blocks, KEYSTREAM_BATCH_BLOCKS)
+                view[filled:filled + count * 64] = chacha20_blocks(self.key, self.counter, self.nonce, count)
+                self.counter = (self.counter + count) & 0xFFFFFFFF
+                filled += count * 64
+                blocks -= count
+
+        # Остальное — из внутреннего буфера
+        while filled < n:
+            self._refill()
+            take = min(n - filled, len(self.buffer))
+            view[filled:filled + take] = self._view[:take]
+            self.pos = take
+            filled += take
+        return n
 
     def read(self, n: int) -> bytes:
-        result = b''
-        while len(result) < n:
-            if self.pos >= len(self.buffer):
-                self._refill()
-            need = min(n - len(result), len(self.buffer) - self.pos)
-            result += self.buffer[self.pos:self.pos + need]
-            self.pos += need
-        return result
+        result = bytearray(n)
+        self.readinto(result)
+        return bytes(result)
 
     def rand32(self) -> int:
         """Возвращает одно 32-битное случайное число."""
+        if self.pos >= len(self.buffer):
+            self._refill()
+        if self.pos & 3 == 0:
+            # Выровненная позиция — готовое слово из буфера
+            if self._words is None:
+                self._words = np.frombuffer(self.buffer, dtype='<u4').tolist()
+            value = self._words[self.pos >> 2]
+            self.pos += 4
+            return value
         return int.from_bytes(self.read(4), 'little')
 
+class ChaCha20Cipher:
+    '''Потоковое шифрование ChaCha20 по RFC 8439: шифртекст = открытый текст XOR ключевой поток.
+
+    Позиция в потоке задаётся в байтах; seek переставляет счётчик блоков
+    сразу на нужный блок, поэтому расшифровка фрагмента из середины большого
+    файла не генерирует предыдущую часть ключевого потока. При processes > 1
+    большие порции шифруются в пуле процессов.'''
+    def __init__(self, key: bytes, nonce: bytes, counter: int = 1, processes: int = 1):
+        if len(key) != 32:
+            raise ValueError("Key must be 32 bytes (256 bits)")
+        if len(nonce) != 12:
+            raise ValueError("Nonce must be 12 bytes (96 bits)")
+        self.key = [int.from_bytes(key[i:i+4], 'little') for i in range(0, 32, 4)]
+        self.nonce = [int.from_bytes(nonce[i:i+4], 'little') for i in range(0, 12, 4)]
+        self.initial_counter = counter
+        self.position = 0
+        self.processes = processes
+
+    def seek(self, offset: int) -> int:
+        """Переход к байту offset ключевого потока."""
+        if offset < 0:
+            raise ValueError("Offset must be non-negative")
+        if self.initial_counter + offset // 64 > 0xFFFFFFFF:
+            raise ValueError("Offset exceeds the 32-bit block counter range")
+        self.position = offset
+        return offset
+
+    def tell(self) -> int:
+        return self.position
+
+    def encrypt(self, data: bytes) -> bytes:
+        """Шифрует очередную порцию данных с текущей позиции."""
+        n = len(data)
+        if n == 0:
+            return b''
+        if self.initial_counter + (self.position + n - 1) // 64 > 0xFFFFFFFF:
+            raise ValueError("Data exceeds the 32-bit block counter range")
+        skip = self.position % 64
+        counter = self.initial_counter + self.position // 64
+        stream = parallel_keystream(self.key, counter, self.nonce, skip + n, self.processes)
+        result = np.bitwise_xor(np.frombuffer(data, dtype=np.uint8),
+                                np.frombuffer(stream, dtype=np.uint8, offset=skip))
+        self.position += n
+        return result.tobytes()
+
+    # Шифрование и расшифрование совпадают
+    decrypt = encrypt
+
+    def encrypt_iter(self, chunks):
+        """Шифрует итерируемый поток порций, выдавая результат по мере обработки."""
+        for chunk in chunks:
+            yield self.encrypt(chunk)
+
+    decrypt_iter = encrypt_iter
+
+    def encrypt_stream(self, source, target, chunk_size: int = 1 << 20, length: int = None):
+        """Шифрует файл source в target частями по chunk_size байт.
+
+        Если задан length, обрабатывается не больше length байт — удобно вместе с
+        seek для расшифровки фрагмента большого файла."""
+        remaining = length
+        while remaining is None or remaining > 0:
+            size = chunk_size if remaining is None else min(chunk_size, remaining)
+            chunk = source.read(size)
+            if not chunk:
+                break
+            target.write(self.encrypt(chunk))
+            if remaining is not None:
+                remaining -= len(chunk)
+
+    decrypt_stream = encrypt_stream
+
+
+def _encrypt_file_range(key, nonce, counter, source, target, start, stop, chunk_size):
+    """Шифрует байты [start, stop) файла source в те же позиции файла target."""
+    cipher = ChaCha20Cipher(key, nonce, counter)
+    cipher.seek(start)
+    with open(source, 'rb') as fin, open(target, 'r+b') as fout:
+        fin.seek(start)
+        fout.seek(start)
+        cipher.encrypt_stream(fin, fout, chunk_size, length=stop - start)
+
+
+def encrypt_file_parallel(key: bytes, nonce: bytes, source, target, counter: int = 1,
+                          processes=None, chunk_size: int = 1 << 20):
+    """Шифрует файл в пуле процессов: каждый процесс обрабатывает свой диапазон байтов.
+
+    Диапазоны выровнены по 64 байтам, каждый процесс сам читает и пишет свою
+    часть файла, так что данные не пересылаются между процессами. Процессов
+    берётся не больше, чем порций по chunk_size в файле. Результат
+    совпадает с последовательным ChaCha20Cipher.encrypt_stream; source и target
+    могут быть одним файлом — тогда он шифруется на месте.
+    """
+    size = os.path.getsize(source)
+    if not (os.path.exists(target) and os.path.samefile(source, target)):
+        with open(target, 'wb') as fout:
+            fout.truncate(size)
+    # Если source и target — один файл, он шифруется на месте: каждый процесс
+    # читает порцию и записывает результат в те же позиции, файл не обрезается
+
+    processes = processes or os.cpu_count() or 1
+    blocks = (size + 63) // 64
+    workers = min(processes, -(-size // chunk_size))
+    if workers <= 1:
+        _encrypt_file_range(key, nonce, counter, source, target, 0, size, chunk_size)
+        return
+    bounds = [min(blocks * i // workers * 64, size) for i in range(workers + 1)]
+    pool = _shared_executor(processes)
+    futures = [pool.submit(_encrypt_file_range, key, nonce, counter, source, target,
+                           start, stop, chunk_size) for start, stop in zip(bounds[:-1], bounds[1:])]
+    for future in futures:
+        future.result()
+
+
+decrypt_file_parallel = encrypt_file_parallel
+
+
+def rfc8439_self_test():
+    """Проверка на тестовых векторах RFC 8439 (разделы 2.3.2 и 2.4.2)."""
+    key = bytes(range(32))
+    key_words = [int.from_bytes(key[i:i+4], 'little') for i in range(0, 32, 4)]
+
+    # 2.3.2: функция блока
+    nonce = bytes.fromhex('000000090000004a00000000')
+    nonce_words = [int.from_bytes(nonce[i:i+4], 'little') for i in range(0, 12, 4)]
+    expected_block = bytes.fromhex(
+        '10f1e7e4d13b5915500fdd1fa32071c4c7d1f4c733c068030422aa9ac3d46c4e'
+        'd2826446079faa0914c2d705d98b02a2b5129cd1de164eb9cbd083e8a2503c4e')
+    assert chacha20_block(key_words, 1, nonce_words) == expected_block
+    assert chacha20_blocks(key_words, 1, nonce_words, 1) == expected_block
+
+    # 2.4.2: шифрование
+    plaintext = (b"Ladies and Gentlemen of the class of '99: If I could offer you only one tip "
+                 b"for the future, sunscreen would be it.")
+    expected = bytes.fromhex(
+        '6e2e359a2568f98041ba0728dd0d6981e97e7aec1d4360c20a27afccfd9fae0b'
+        'f91b65c5524733ab8f593dabcd62b3571639d624e65152ab8f530c359f0861d8'
+        '07ca0dbf500d6a6156a38e088a22b65e52bc514d16ccf806818ce91ab7793736'
+        '5af90bbf74a35be6b40b8eedf2785e42874d')
+    cipher = ChaCha20Cipher(key, bytes.fromhex('000000000000004a00000000'))
+    assert cipher.encrypt(plaintext) == expected
+
+    # Произвольный доступ: расшифровка с середины через seek
+    cipher.seek(70)
+    assert cipher.decrypt(expected[70:]) == plaintext[70:]
+    return True
+
+
 if __name__ == "__main__":
+    import matplotlib.pyplot as plt
+    from stat_tests import chunks_from_read, print_results, run_battery
+    rfc8439_self_test()
+    print("Тестовые векторы RFC 8439: пройдены")
+
     input_data = f"{time.time()}_{os.getpid()}".encode('utf-8')
     key = hashlib.sha256(input_data).digest()
     rng = ChaCha20RNG(key)
 
     N = 100_000
-    data = [rng.rand32() / (2**32) for _ in range(N)]  # числа в [0, 1)
+    data = np.frombuffer(rng.read(4 * N), dtype='<u4') / 2**32  # числа в [0, 1)
 
     # === 1. Гистограмма ===
     plt.figure(figsize=(10, 4))
@@ -151,12 +491,7 @@ if __name__ == "__main__":
     plt.tight_layout()
     plt.show()
 
-    # === 3. Статистика ===
-    mean_val = sum(data) / N
-    variance_val = sum((x - 0.5) ** 2 for x in data) / N
-
-    print(f"\n📊 Статистика по {N} числам:")
-    print(f"Среднее:       {mean_val:.5f} (ожидается ~0.50000)")
-    print(f"Дисперсия:     {variance_val:.5f} (ожидается ~0.08333 = 1/12)")
-    print(f"Отклонение среднего: {abs(mean_val - 0.5):.5f}")
-    print(f"Отклонение дисперсии: {abs(variance_val - 1/12):.5f}")
\ No newline at end of file
+    # === 3. Статистические тесты на потоке 2^24 слов (память — одна порция) ===
+    TOTAL = 1 << 24
+    print(f"\n📊 Статистические тесты по {TOTAL} числам:")
+    print_results(run_battery(chunks_from_read(rng.read, TOTAL)))
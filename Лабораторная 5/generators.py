@@ -0,0 +1,163 @@
+'''
+Единый интерфейс к генераторам Лабораторной 5 и замер их скорости.
+
+У генераторов разная форма: ChaCha20RNG отдаёт байты (read/rand32),
+SimpleMT — числа uint32 (rand/rand_array), lcg — бесконечный генератор
+чисел в [0, 1) и функция generate, BBS — байты. Обёртки ниже приводят их к
+одному набору методов:
+
+    next_uint32()  — одно 32-битное число (скалярный путь);
+    uint32(n)      — массив n чисел uint32 (пакетный путь);
+    bytes(n)       — n случайных байтов;
+    random(n)      — массив n чисел float64 в [0, 1).
+
+benchmark() меряет скалярный и пакетные пути каждого генератора и печатает
+МБ/с и нс на одно 32-битное значение.
+'''
+
+import importlib.util
+import os
+import time
+from pathlib import Path
+
+import numpy as np
+
+from chacha20 import ChaCha20RNG
+from lcg import generate, lcg_jump
+
+
+def _load(filename, name):
+    """Импорт модуля лабораторной по имени файла (в имени могут быть пробелы и скобки)."""
+    spec = importlib.util.spec_from_file_location(name, Path(__file__).with_name(filename))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+_mt = _load("вихрь Мерсенна.py", "mersenne")
+_bbs = _load("Blum-Blum-Shub(BBS).py", "bbs")
+
+
+class RandomSource:
+    """Общий интерфейс. Наследник задаёт next_uint32 и uint32 либо read (байтовый генератор)."""
+    name = ''
+
+    def next_uint32(self):
+        return int.from_bytes(self.read(4), 'little')
+
+    def uint32(self, n):
+        return np.frombuffer(self.read(4 * n), dtype='<u4')
+
+    def bytes(self, n):
+        # Байты из целых слов; остаток последнего слова отбрасывается
+        return self.uint32((n + 3) // 4).astype('<u4').tobytes()[:n]
+
+    def random(self, n):
+        return self.uint32(n) / 2.0**32
+
+
+class ChaCha20Source(RandomSource):
+    name = 'ChaCha20'
+
+    def __init__(self, key=None, nonce=b'\x00' * 12):
+        self.rng = ChaCha20RNG(os.urandom(32) if key is None else key, nonce)
+        self.read = self.rng.read
+
+    def next_uint32(self):
+        return self.rng.rand32()
+
+    def bytes(self, n):
+        return self.rng.read(n)
+
+
+class MersenneSource(RandomSource):
+    name = 'MT19937'
+
+    def __init__(self, seed=5489):
+        self.mt = _mt.SimpleMT(seed)
+
+    def next_uint32(self):
+        return self.mt.rand()
+
+    def uint32(self, n):
+        return self.mt.rand_array(n)
+
+
+class LCGSource(RandomSource):
+    """LCG с явным состоянием: скалярный и пакетный пути продолжают одну последовательность."""
+    name = 'LCG'
+
+    def __init__(self, seed=1, a=1664525, c=1013904223, m=2**32):
+        self.state, self.a, self.c, self.m = seed, a, c, m
+
+    def next_uint32(self):
+        self.state = (self.a * self.state + self.c) % self.m
+        return (self.state << 32) // self.m
+
+    def random(self, n):
+        values = generate(n, self.state, self.a, self.c, self.m)
+        self.state = lcg_jump(self.state, n, self.a, self.c, self.m)
+        return values
+
+    def uint32(self, n):
+        return (self.random(n) * 2.0**32).astype(np.uint32)
+
+
+class BBSSource(RandomSource):
+    name = 'BBS'
+
+    def __init__(self, bits=1024, seed=None, p=None, q=None):
+        self.bbs = _bbs.BBS(bits, seed, p, q)
+        self.read = self.bbs.read
+
+    def bytes(self, n):
+        return self.bbs.read(n)
+
+
+def default_sources():
+    return [ChaCha20Source(), MersenneSource(), LCGSource(), BBSSource()]
+
+
+def _measure(call, count, min_time):
+    """Время на одно значение: count удваивается, пока замер не займёт min_time секунд."""
+    while True:
+        start = time.perf_counter()
+        call(count)
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            return elapsed / count
+        count *= 2
+
+
+def benchmark(sources=None, min_time=0.2, chunk=1 << 16):
+    """Замер путей каждого генератора: список (генератор, путь, МБ/с, нс/значение).
+
+    Скалярный путь — вызовы next_uint32 по одному, пакетные — uint32, bytes
+    и random порциями по chunk значений. Скорость пересчитана на 32-битные
+    значения (4 байта), чтобы пути и генераторы сравнивались напрямую.
+    """
+    sources = default_sources() if sources is None else sources
+    rows = []
+    for source in sources:
+        paths = [
+            ('скаляр', lambda k, s=source: [s.next_uint32() for _ in range(k)], 256),
+            ('uint32', lambda k, s=source: [s.uint32(chunk) for _ in range(k)], 1),
+            ('bytes', lambda k, s=source: [s.bytes(4 * chunk) for _ in range(k)], 1),
+            ('random', lambda k, s=source: [s.random(chunk) for _ in range(k)], 1),
+        ]
+        for path, call, count in paths:
+            seconds = _measure(call, count, min_time)
+            if path != 'скаляр':
+                seconds /= chunk
+            rows.append((source.name, path, 4 / seconds / 1e6, seconds * 1e9))
+    return rows
+
+
+def print_benchmark(rows):
+    print(f"{'Генератор':<12}{'Путь':<10}{'МБ/с':>12}{'нс/значение':>14}")
+    for name, path, mbps, ns in rows:
+        print(f"{name:<12}{path:<10}{mbps:>12.2f}{ns:>14.1f}")
+
+
+if __name__ == "__main__":
+    print_benchmark(benchmark())
@@ -1,4 +1,6 @@
-import matplotlib.pyplot as plt
+from itertools import islice
+
+import numpy as np
 
 # Линейный конгруэнтный генератор (LCG)
 def lcg(seed=1, a=1664525, c=1013904223, m=2**32):
@@ -6,20 +8,93 @@ def lcg(seed=1, a=1664525, c=1013904223, m=2**32):
         seed = (a * seed + c) % m
         yield seed / m  # нормализуем в [0, 1)
 
-# Генерация N чисел
-N = 10_000
-rng = lcg(seed=12345)
-data = [next(rng) for _ in range(N)]
-
-# Проверка качества: гистограмма
-plt.hist(data, bins=50, density=True, alpha=0.7, color='blue')
-plt.title("Гистограмма псевдослучайных чисел (LCG)")
-plt.xlabel("Значение")
-plt.ylabel("Плотность")
-plt.axhline(1, color='red', linestyle='--', label='Идеальная равномерность')
-plt.legend()
-plt.show()
-
-# Простая статистика
-print(f"Среднее: {sum(data)/N:.4f} (ожидаемо ~0.5)")
-print(f"Дисперсия: {sum((x - 0.5)**2 for x in data)/N:.4f} (ожидаемо ~1/12 ≈ 0.0833)")
\ No newline at end of file
+def lcg_affine_power(steps, a=1664525, c=1013904223, m=2**32):
+    """Коэффициенты (A, C) отображения x -> A*x + C (mod m), равного steps шагам LCG.
+
+    Шаг LCG — аффинное отображение; композиция таких отображений снова
+    аффинная, поэтому steps-я степень считается бинарным возведением за O(log steps).
+    """
+    A, C = 1, 0          # тождественное отображение
+    pa, pc = a % m, c % m  # отображение на 2^i шагов
+    while steps:
+        if steps & 1:
+            A, C = (pa * A) % m, (pa * C + pc) % m
+        pa, pc = (pa * pa) % m, (pa * pc + pc) % m
+        steps >>= 1
+    return A, C
+
+def lcg_jump(seed, steps, a=1664525, c=1013904223, m=2**32):
+    """Состояние генератора через steps шагов от seed."""
+    A, C = lcg_affine_power(steps, a, c, m)
+    return (A * seed + C) % m
+
+def spawn(k, seed=1, a=1664525, c=1013904223, m=2**32, stride=None):
+    """k непересекающихся подпотоков lcg: i-й начинается через i * stride шагов от seed.
+
+    По умолчанию период m делится поровну между подпотоками.
+    """
+    if stride is None:
+        stride = m // k
+    return [lcg(lcg_jump(seed, i * stride, a, c, m), a, c, m) for i in range(k)]
+
+def generate(n, seed=1, a=1664525, c=1013904223, m=2**32, lanes=4096):
+    """n чисел массивом NumPy — та же последовательность, что даёт lcg(seed, a, c, m).
+
+    Последовательность раскладывается по lanes «полосам»: строка r массива —
+    элементы r * lanes + 1 .. (r + 1) * lanes. Первая строка строится
+    удвоением (блок длины b продолжается отображением на b шагов), дальше
+    каждая строка получается из предыдущей одним отображением
+    x -> A*x + C, где (A, C) = (a^lanes, c_lanes). Так все полосы движутся
+    параллельно векторными операциями.
+    """
+    if m > 2**32:
+        # Произведения A*x перестают помещаться в uint64 — остаётся скалярный путь
+        return np.fromiter(islice(lcg(seed, a, c, m), n), dtype=np.float64, count=n)
+    if n <= 0:
+        return np.empty(0, dtype=np.float64)
+    lanes = max(1, min(lanes, n))
+    rows = -(-n // lanes)
+
+    # Первая строка: x_1..x_lanes удвоением блоков
+    first = np.array([(a * seed + c) % m], dtype=np.uint64)
+    while first.size < lanes:
+        A, C = lcg_affine_power(first.size, a, c, m)
+        first = np.concatenate((first, (np.uint64(A) * first + np.uint64(C)) % np.uint64(m)))
+
+    states = np.empty((rows, lanes), dtype=np.uint64)
+    states[0] = first[:lanes]
+    A, C = (np.uint64(v) for v in lcg_affine_power(lanes, a, c, m))
+    for r in range(1, rows):
+        np.multiply(states[r - 1], A, out=states[r])
+        states[r] += C
+        states[r] %= np.uint64(m)
+    return states.reshape(-1)[:n] / m
+
+if __name__ == "__main__":
+    import matplotlib.pyplot as plt
+    from stat_tests import chunks_from_floats, print_results, run_battery
+    # Генерация N чисел
+    N = 10_000
+    data = generate(N, seed=12345)
+
+    # Проверка качества: гистограмма
+    plt.hist(data, bins=50, density=True, alpha=0.7, color='blue')
+    plt.title("Гистограмма псевдослучайных чисел (LCG)")
+    plt.xlabel("Значение")
+    plt.ylabel("Плотность")
+    plt.axhline(1, color='red', linestyle='--', label='Идеальная равномерность')
+    plt.legend()
+    plt.show()
+
+    # Статистические тесты на потоке 2^24 чисел: генератор продолжается
+    # с последнего состояния, в памяти только одна порция
+    TOTAL = 1 << 24
+    state = [lcg_jump(12345, N)]
+
+    def next_chunk(n):
+        values = generate(n, seed=state[0])
+        state[0] = lcg_jump(state[0], n)
+        return values
+
+    print(f"Статистические тесты по {TOTAL} числам:")
+    print_results(run_battery(chunks_from_floats(next_chunk, TOTAL)))
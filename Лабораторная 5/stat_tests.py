@@ -0,0 +1,279 @@
+'''
+Набор статистических тестов для генераторов Лабораторной 5.
+
+Генератор подаётся как поток порций 32-битных слов (массивы uint32), каждый
+тест накапливает только свои суммы, поэтому память не зависит от длины
+выборки и проверять можно миллиарды значений. Порции обрабатываются всеми
+тестами одновременно в пуле потоков — операции NumPy отпускают GIL.
+
+Тесты: хи-квадрат равномерности, частотный (monobit) и блочный частотный
+из NIST SP 800-22, тест серий (runs, NIST), сериальная корреляция Кнута и
+дни рождения Марсальи (birthday spacings).
+'''
+
+import math
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+
+# note — пояснение, если статистика не посчитана (statistic тогда None)
+TestResult = namedtuple('TestResult', 'name statistic p_value passed note', defaults=('',))
+
+# Уровень значимости, как в NIST SP 800-22
+ALPHA = 0.01
+
+
+def igamc(a, x):
+    """Регуляризованная верхняя неполная гамма-функция Q(a, x)."""
+    if x <= 0:
+        return 1.0
+    if x < a + 1:
+        # Ряд для P(a, x)
+        term = total = 1.0 / a
+        k = a
+        while abs(term) > abs(total) * 1e-15:
+            k += 1
+            term *= x / k
+            total += term
+        return max(0.0, 1.0 - total * math.exp(-x + a * math.log(x) - math.lgamma(a)))
+    # Цепная дробь Лентца для Q(a, x)
+    tiny = 1e-300
+    b = x + 1 - a
+    c = 1 / tiny
+    d = 1 / b
+    h = d
+    for i in range(1, 10000):
+        an = -i * (i - a)
+        b += 2
+        d = an * d + b
+        d = tiny if abs(d) < tiny else d
+        c = b + an / c
+        c = tiny if abs(c) < tiny else c
+        d = 1 / d
+        delta = d * c
+        h *= delta
+        if abs(delta - 1) < 1e-15:
+            break
+    return h * math.exp(-x + a * math.log(x) - math.lgamma(a))
+
+
+def _result(name, statistic, p_value):
+    return TestResult(name, statistic, p_value, p_value >= ALPHA)
+
+
+class ChiSquareTest:
+    """Хи-квадрат равномерности по старшим битам слова."""
+    name = 'Хи-квадрат'
+
+    def __init__(self, bits=8):
+        self.bits = bits
+        self.counts = np.zeros(1 << bits, dtype=np.int64)
+
+    def update(self, words):
+        self.counts += np.bincount(words >> np.uint32(32 - self.bits), minlength=len(self.counts))
+
+    def result(self):
+        n = self.counts.sum()
+        expected = n / len(self.counts)
+        chi2 = float(((self.counts - expected) ** 2).sum() / expected)
+        return _result(self.name, chi2, igamc((len(self.counts) - 1) / 2, chi2 / 2))
+
+
+class MonobitTest:
+    """NIST 2.1: доля единиц во всём потоке бит."""
+    name = 'Частотный (monobit)'
+
+    def __init__(self):
+        self.ones = 0
+        self.n = 0
+
+    def update(self, words):
+        self.ones += int(np.bitwise_count(words).sum())
+        self.n += 32 * words.size
+
+    def result(self):
+        s = abs(2 * self.ones - self.n) / math.sqrt(self.n)
+        return _result(self.name, s, math.erfc(s / math.sqrt(2)))
+
+
+class BlockFrequencyTest:
+    """NIST 2.2: доля единиц в блоках по block_words * 32 бит."""
+    name = 'Блочный частотный'
+
+    def __init__(self, block_words=4):
+        self.block_words = block_words
+        self.chi = 0.0
+        self.blocks = 0
+        self.rest = np.zeros(0, dtype=np.uint32)
+
+    def update(self, words):
+        data = np.concatenate((self.rest, words))
+        full = data.size // self.block_words * self.block_words
+        ones = np.bitwise_count(data[:full]).reshape(-1, self.block_words).sum(axis=1)
+        m = 32 * self.block_words
+        self.chi += float(((ones / m - 0.5) ** 2).sum())
+        self.blocks += ones.size
+        self.rest = data[full:]
+
+    def result(self):
+        chi2 = 4 * 32 * self.block_words * self.chi
+        return _result(self.name, chi2, igamc(self.blocks / 2, chi2 / 2))
+
+
+class RunsTest:
+    """NIST 2.3: число серий одинаковых бит (биты слова — от старшего к младшему)."""
+    name = 'Серии (runs)'
+
+    def __init__(self):
+        self.ones = 0
+        self.n = 0
+        self.transitions = 0
+        self.last = None
+
+    def update(self, words):
+        if words.size == 0:
+            return
+        self.ones += int(np.bitwise_count(words).sum())
+        self.n += 32 * words.size
+        # Смены бита внутри слова
+        inside = (words ^ (words >> np.uint32(1))) & np.uint32(0x7FFFFFFF)
+        self.transitions += int(np.bitwise_count(inside).sum())
+        # На стыке слов: младший бит предыдущего и старший бит следующего
+        first_bits = words >> np.uint32(31)
+        last_bits = words & np.uint32(1)
+        self.transitions += int((last_bits[:-1] != first_bits[1:]).sum())
+        if self.last is not None:
+            self.transitions += int(self.last != first_bits[0])
+        self.last = int(last_bits[-1])
+
+    def result(self):
+        pi = self.ones / self.n
+        if abs(pi - 0.5) >= 2 / math.sqrt(self.n):
+            # Не пройден предварительный частотный тест: серии не считаются
+            return TestResult(self.name, None, 0.0, False, 'не пройден предварительный частотный тест')
+        runs = self.transitions + 1
+        expected = 2 * self.n * pi * (1 - pi)
+        statistic = abs(runs - expected) / (2 * math.sqrt(2 * self.n) * pi * (1 - pi))
+        return _result(self.name, statistic, math.erfc(statistic))
+
+
+class SerialCorrelationTest:
+    """Сериальная корреляция соседних значений (Кнут, том 2, 3.3.2)."""
+    name = 'Сериальная корреляция'
+
+    def __init__(self):
+        self.n = 0
+        self.sum = 0.0
+        self.sum_sq = 0.0
+        self.sum_prod = 0.0
+        self.first = None
+        self.last = None
+
+    def update(self, words):
+        if words.size == 0:
+            return
+        u = words / 2.0**32
+        self.n += u.size
+        self.sum += float(u.sum())
+        self.sum_sq += float(np.dot(u, u))
+        self.sum_prod += float(np.dot(u[:-1], u[1:]))
+        if self.last is not None:
+            self.sum_prod += self.last * float(u[0])
+        else:
+            self.first = float(u[0])
+        self.last = float(u[-1])
+
+    def result(self):
+        # Циклическое замыкание последнего значения на первое
+        prod = self.sum_prod + self.last * self.first
+        n = self.n
+        c = (n * prod - self.sum ** 2) / (n * self.sum_sq - self.sum ** 2)
+        z = c * math.sqrt(n)
+        return _result(self.name, c, math.erfc(abs(z) / math.sqrt(2)))
+
+
+class BirthdaySpacingsTest:
+    """Дни рождения Марсальи: m дней рождения в году из 2^bits дней.
+
+    Число повторяющихся расстояний в одной выборке приближённо распределено по
+    Пуассону с λ = m^2 (m - 1) / (4 * 2^bits); сумма по всем выборкам
+    сравнивается с ожидаемой. Год берётся во все 32 бита: при классических
+    m = 512, 2^24 дней тройные совпадения смещают среднее на ~0.5%, и на
+    длинных потоках тест начинает браковать хорошие генераторы.
+    """
+    name = 'Дни рождения'
+
+    def __init__(self, m=2048, bits=32):
+        self.m = m
+        self.bits = bits
+        self.lam = m * m * (m - 1) / (4 * 2 ** bits)
+        self.samples = 0
+        self.repeats = 0
+        self.rest = np.zeros(0, dtype=np.uint32)
+
+    def update(self, words):
+        data = np.concatenate((self.rest, words))
+        full = data.size // self.m * self.m
+        days = np.sort(data[:full].reshape(-1, self.m) >> np.uint32(32 - self.bits), axis=1)
+        spacings = np.sort(np.diff(days, axis=1, prepend=0), axis=1)
+        self.repeats += int((np.diff(spacings, axis=1) == 0).sum())
+        self.samples += days.shape[0]
+        self.rest = data[full:]
+
+    def result(self):
+        expected = self.samples * self.lam
+        z = (self.repeats - expected) / math.sqrt(expected)
+        return _result(self.name, z, math.erfc(abs(z) / math.sqrt(2)))
+
+
+def default_tests():
+    return [ChiSquareTest(), MonobitTest(), BlockFrequencyTest(), RunsTest(),
+            SerialCorrelationTest(), BirthdaySpacingsTest()]
+
+
+def run_battery(chunks, tests=None, workers=None):
+    """Прогоняет поток порций uint32 через все тесты; тесты работают параллельно в потоках."""
+    tests = default_tests() if tests is None else tests
+    with ThreadPoolExecutor(max_workers=workers or len(tests)) as pool:
+        for chunk in chunks:
+            words = np.asarray(chunk, dtype=np.uint32)
+            # Все тесты обрабатывают порцию, затем берётся следующая
+            for future in [pool.submit(test.update, words) for test in tests]:
+                future.result()
+    return [test.result() for test in tests]
+
+
+def print_results(results):
+    print(f"{'Тест':<24}{'Статистика':>14}{'p-значение':>14}  Итог")
+    for r in results:
+        statistic = '—' if r.statistic is None else f"{r.statistic:.5f}"
+        verdict = 'пройден' if r.passed else 'НЕ пройден'
+        print(f"{r.name:<24}{statistic:>14}{r.p_value:>14.5f}  {verdict}" + (f" ({r.note})" if r.note else ''))
+
+
+# --- Источники порций для разных интерфейсов генераторов ---
+
+def chunks_from_read(read, total_words, chunk_words=1 << 20):
+    """Порции из генератора байтов с методом read(n) (ChaCha20RNG, BBS)."""
+    while total_words > 0:
+        n = min(chunk_words, total_words)
+        yield np.frombuffer(read(4 * n), dtype='<u4')
+        total_words -= n
+
+
+def chunks_from_uint32(func, total_words, chunk_words=1 << 20):
+    """Порции из функции, возвращающей массив n слов uint32 (SimpleMT.rand_array)."""
+    while total_words > 0:
+        n = min(chunk_words, total_words)
+        yield func(n)
+        total_words -= n
+
+
+def chunks_from_floats(func, total_words, chunk_words=1 << 20):
+    """Порции из функции, возвращающей n чисел в [0, 1) (lcg.generate); числа переводятся в uint32."""
+    while total_words > 0:
+        n = min(chunk_words, total_words)
+        yield (np.asarray(func(n)) * 2.0**32).astype(np.uint32)
+        total_words -= n
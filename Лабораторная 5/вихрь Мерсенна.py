@@ -1,30 +1,55 @@
+from functools import lru_cache
+
+import numpy as np
+
+# Шаг между соседними подпотоками spawn: 2^128 чисел
+JUMP_STEPS = 2 ** 128
+
+
 class SimpleMT:
     def __init__(self, seed=5489):
         self.N = 624
         self.M = 397
         self.MATRIX_A = 0x9908B0DF
-        self.state = [0] * self.N
+        self.state = np.zeros(self.N, dtype=np.uint32)
         self.index = self.N
 
         # Инициализация (упрощённая)
-        self.state[0] = seed & 0xFFFFFFFF
+        value = seed & 0xFFFFFFFF
+        words = [value]
         for i in range(1, self.N):
-            self.state[i] = (1812433253 * (self.state[i-1] ^ (self.state[i-1] >> 30)) + i) & 0xFFFFFFFF
+            value = (1812433253 * (value ^ (value >> 30)) + i) & 0xFFFFFFFF
+            words.append(value)
+        self.state[:] = words
+        self._words = words
 
     def _twist(self):
-        for i in range(self.N):
-            x = (self.state[i] & 0x80000000) + (self.state[(i+1) % self.N] & 0x7FFFFFFF)
-            xA = x >> 1
-            if x % 2:
-                xA ^= self.MATRIX_A
-            self.state[i] = self.state[(i + self.M) % self.N] ^ xA
+        self._twist_array(self.state)
+        self._words = self.state.tolist()
         self.index = 0
 
+    def _twist_array(self, mt):
+        # Перемешивание всего состояния сразу, массивами. Слово i зависит от i+1
+        # (ещё старого) и i+M, которое для i >= N-M уже обновлено на этом же
+        # проходе, поэтому работаем отрезками, внутри которых зависимостей нет:
+        # [0, N-M) берёт старые слова, дальше — куски длиной не больше N-M,
+        # опирающиеся на уже пересчитанные, и последнее слово отдельно (нужно новое state[0]).
+        n, m = self.N, self.M
+        start = 0
+        while start < n - 1:
+            stop = min(start + (n - m), n - 1)
+            y = (mt[start:stop] & 0x80000000) | (mt[start + 1:stop + 1] & 0x7FFFFFFF)
+            source = np.arange(start + m, stop + m) % n
+            mt[start:stop] = mt[source] ^ (y >> 1) ^ ((y & 1) * np.uint32(self.MATRIX_A))
+            start = stop
+        y = (int(mt[n - 1]) & 0x80000000) | (int(mt[0]) & 0x7FFFFFFF)
+        mt[n - 1] = int(mt[m - 1]) ^ (y >> 1) ^ (self.MATRIX_A if y & 1 else 0)
+
     def rand(self):
         if self.index >= self.N:
             self._twist()
 
-        y = self.state[self.index]
+        y = self._words[self.index]
         self.index += 1
 
         # Темперирование (улучшает статистику)
@@ -35,6 +60,174 @@ class SimpleMT:
 
         return y & 0xFFFFFFFF
 
-# Пример использования
-mt = SimpleMT(seed=12345)
-print([mt.rand() % 100 for _ in range(10)])  # 10 случайных чисел от 0 до 99
+    def rand_array(self, n):
+        """Возвращает n следующих чисел массивом uint32 (та же последовательность, что у rand)."""
+        parts = []
+        remaining = n
+        while remaining > 0:
+            if self.index >= self.N:
+                self._twist()
+            take = min(remaining, self.N - self.index)
+            parts.append(self.state[self.index:self.index + take].copy())
+            self.index += take
+            remaining -= take
+        y = np.concatenate(parts) if parts else np.zeros(0, dtype=np.uint32)
+
+        # Темперирование всего блока сразу
+        y ^= (y >> 11)
+        y ^= (y << 7) & np.uint32(0x9D2C5680)
+        y ^= (y << 15) & np.uint32(0xEFC60000)
+        y ^= (y >> 18)
+        return y
+
+    def _window(self):
+        """Следующие N нетемперированных слов, которые будут выданы генератором."""
+        following = self.state.copy()
+        self._twist_array(following)
+        if self.index >= self.N:
+            return following
+        return np.concatenate((self.state[self.index:], following[:self.index]))
+
+    def jump(self, steps):
+        """Перескакивает вперёд на steps чисел без их генерации.
+
+        Окно из N слов — это состояние линейного над GF(2) отображения T (один
+        шаг рекурренты). T^steps заменяется многочленом p(T), где
+        p(x) = x^steps mod phi(x), а phi — характеристический многочлен
+        MT19937 степени 19937. Стоимость — O(log steps) возведений в квадрат
+        по модулю phi и один проход схемы Горнера по коэффициентам p.
+        """
+        if steps < 0:
+            raise ValueError("steps must be non-negative")
+        window = self._window()
+        poly = _jump_polynomial(steps)
+
+        n, m = self.N, self.M
+        doubled = np.concatenate((window, window))
+        acc = np.zeros(n, dtype=np.uint32)
+        ptr = 0
+        for power in range(poly.bit_length() - 1, -1, -1):
+            # acc = T(acc): новое слово заменяет самое старое
+            y = (int(acc[ptr]) & 0x80000000) | (int(acc[(ptr + 1) % n]) & 0x7FFFFFFF)
+            acc[ptr] = int(acc[(ptr + m) % n]) ^ (y >> 1) ^ (self.MATRIX_A if y & 1 else 0)
+            ptr = (ptr + 1) % n
+            if (poly >> power) & 1:
+                # acc += окно, выровненное по текущему началу acc
+                acc ^= doubled[n - ptr:2 * n - ptr]
+
+        self.state = np.concatenate((acc[ptr:], acc[:ptr]))
+        self._words = self.state.tolist()
+        self.index = 0
+        return self
+
+    def spawn(self, k, steps=JUMP_STEPS):
+        """Возвращает k независимых генераторов: i-й начинается через i * steps чисел от текущей позиции."""
+        streams = []
+        current = self._copy()
+        for _ in range(k):
+            streams.append(current._copy())
+            current.jump(steps)
+        return streams
+
+    def _copy(self):
+        other = SimpleMT.__new__(SimpleMT)
+        other.__dict__.update(self.__dict__)
+        other.state = self.state.copy()
+        other._words = list(self._words)
+        return other
+
+
+@lru_cache(maxsize=1)
+def _characteristic_polynomial():
+    """Характеристический многочлен MT19937 (бит i — коэффициент при x^i).
+
+    Восстанавливается алгоритмом Берлекэмпа–Мэсси по младшим битам 2 * 19937
+    слов генератора; многочлены над GF(2) хранятся как целые числа.
+    """
+    mt = SimpleMT(5489)
+    mt._twist()
+    bits = []
+    while len(bits) < 2 * 19937 + mt.N:
+        bits.extend((mt.state & 1).tolist())
+        mt._twist()
+
+    locator, previous, length, shift, window = 1, 1, 0, 1, 0
+    for n, bit in enumerate(bits):
+        window = (window << 1) | bit  # бит i — элемент последовательности с номером n - i
+        if (locator & window).bit_count() & 1:
+            saved = locator
+            locator ^= previous << shift
+            if 2 * length <= n:
+                length, previous, shift = n + 1 - length, saved, 1
+                continue
+        shift += 1
+    # phi(x) = x^L * C(1/x): разворот коэффициентов многочлена связей
+    return int(format(locator, f'0{length + 1}b')[::-1], 2)
+
+
+# Таблица «растяжения» байта: биты b0..b7 → позиции 0, 2, .., 14 (возведение в квадрат над GF(2))
+_SPREAD = np.array([sum(((b >> i) & 1) << (2 * i) for i in range(8)) for b in range(256)], dtype='<u2')
+
+
+@lru_cache(maxsize=1)
+def _reduction_table():
+    """Кратные phi, обнуляющие старший байт: индекс — значение старших 8 бит."""
+    phi = _characteristic_polynomial()
+    degree = phi.bit_length() - 1
+    table = [0] * 256
+    for w in range(256):
+        product = 0
+        for i in range(8):
+            if (w >> i) & 1:
+                product ^= phi << i
+        table[product >> degree] = product
+    return table
+
+
+def _poly_mod(value, phi):
+    """Остаток от деления многочлена над GF(2) на phi, по 8 старших бит за шаг."""
+    degree = phi.bit_length() - 1
+    table = _reduction_table()
+    while value.bit_length() > degree + 8:
+        shift = value.bit_length() - degree - 8
+        value ^= table[value >> (shift + degree)] << shift
+    while value.bit_length() > degree:
+        value ^= phi << (value.bit_length() - degree - 1)
+    return value
+
+
+@lru_cache(maxsize=16)
+def _jump_polynomial(steps):
+    """x^steps mod phi(x): квадраты через таблицу растяжения, умножение на x — сдвиг."""
+    phi = _characteristic_polynomial()
+    result = 1
+    for bit in bin(steps)[2:]:
+        raw = result.to_bytes((result.bit_length() + 7) // 8 or 1, 'little')
+        squared = int.from_bytes(_SPREAD[np.frombuffer(raw, dtype=np.uint8)].tobytes(), 'little')
+        result = _poly_mod(squared, phi)
+        if bit == '1':
+            result = _poly_mod(result << 1, phi)
+    return result
+
+
+def mt19937_self_test():
+    """Сверка с эталонным MT19937 (init_genrand(5489)): первые выходы и 10000-е число."""
+    mt = SimpleMT(seed=5489)
+    assert [mt.rand() for _ in range(5)] == [3499211612, 581869302, 3890346734, 3586334585, 545404204]
+    mt = SimpleMT(seed=5489)
+    assert int(mt.rand_array(10000)[-1]) == 4123659995
+    return True
+
+
+if __name__ == "__main__":
+    from stat_tests import chunks_from_uint32, print_results, run_battery
+    mt19937_self_test()
+
+    # Пример использования
+    mt = SimpleMT(seed=12345)
+    print([mt.rand() % 100 for _ in range(10)])  # 10 случайных чисел от 0 до 99
+
+    # Статистические тесты на потоке 2^24 чисел
+    TOTAL = 1 << 24
+    print(f"Статистические тесты по {TOTAL} числам:")
+    print_results(run_battery(chunks_from_uint32(mt.rand_array, TOTAL)))
@@ -1,37 +1,340 @@
 '''RSA — это асимметричный алгоритм шифрования, названный по первым буквам фамилий его создателей'''
 
 
+import base64
+import hashlib
+import hmac
 import random
 import math
+import multiprocessing
 import os
+import queue
+import re
+import tempfile
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
 
-# упрощённая эмуляция PKCS#1 v1.5
-def simple_pad(message: bytes, k: int) -> int:
-    """Упрощённый паддинг: добавляем случайные байты спереди."""
-    if len(message) > k - 10:
+# --- Паддинг ---
+# Разбор паддинга проходит все байты блока одинаково, без ветвлений по их
+# значениям: сравнения дают маски 0/1, ошибка поднимается один раз в конце.
+# Так время разбора не выдаёт, в каком месте паддинг оказался неверным
+# (атака Блейхенбахера для PKCS#1 v1.5, атака Мангера для OAEP).
+
+def _ct_eq(a, b):
+    """1, если байты a и b равны, иначе 0 — без ветвления."""
+    return (((a ^ b) - 1) >> 8) & 1
+
+def _ct_lt(a, b):
+    """1, если a < b (неотрицательные целые), иначе 0 — без ветвления."""
+    return ((a - b) >> 63) & 1
+
+def _xor(a: bytes, b: bytes) -> bytes:
+    return (int.from_bytes(a, 'big') ^ int.from_bytes(b, 'big')).to_bytes(len(a), 'big')
+
+def pkcs1_v15_pad(message: bytes, k: int) -> int:
+    """Паддинг шифрования PKCS#1 v1.5 (RFC 8017, 7.2.1): 00 02 PS 00 M, PS — ненулевые случайные байты."""
+    if len(message) > k - 11:
         raise ValueError("Сообщение слишком длинное")
-    padding = os.urandom(k - len(message) - 1)  # случайные байты
-    padded = b'\x00' + padding + b'\x01' + message
-    return int.from_bytes(padded, 'big')
+    ps = bytearray()
+    while len(ps) < k - len(message) - 3:
+        ps += os.urandom(k - len(message) - 3 - len(ps)).replace(b'\x00', b'')
+    return int.from_bytes(b'\x00\x02' + bytes(ps) + b'\x00' + message, 'big')
 
-def simple_unpad(padded_int: int, k: int) -> bytes:
+def pkcs1_v15_unpad(padded_int: int, k: int) -> bytes:
     padded = padded_int.to_bytes(k, 'big')
-    if padded[0] != 0:
-        raise ValueError("Неверный паддинг")
-    idx = padded.rfind(b'\x01')
-    if idx == -1:
-        raise ValueError("Разделитель не найден")
-    return padded[idx+1:]
-
-def is_prime(n, k=5):
-    """Тест Миллера–Рабина на простоту (вероятностный)."""
-    if n < 2:
-        return False
-    if n in (2, 3):
-        return True
-    if n % 2 == 0:
-        return False
+    good = _ct_eq(padded[0], 0) & _ct_eq(padded[1], 2)
+    found = separator = 0
+    for i in range(2, k):
+        zero = _ct_eq(padded[i], 0)
+        separator |= -(zero & (1 - found)) & i  # запоминается только первый нулевой байт
+        found |= zero
+    # PS не короче 8 байт: разделитель не раньше 10-го байта
+    good &= found & (1 - _ct_lt(separator, 10))
+    if not good:
+        raise ValueError("Ошибка расшифровки")
+    return padded[separator + 1:]
+
+OAEP_HASH = hashlib.sha256
+_OAEP_HLEN = OAEP_HASH().digest_size
+
+def mgf1(seed: bytes, length: int) -> bytes:
+    """Функция генерации маски MGF1 (RFC 8017, B.2.1) на SHA-256."""
+    out = bytearray()
+    for counter in range(-(-length // _OAEP_HLEN)):
+        out += OAEP_HASH(seed + counter.to_bytes(4, 'big')).digest()
+    return bytes(out[:length])
+
+def oaep_pad(message: bytes, k: int, label: bytes = b'') -> int:
+    """Паддинг RSAES-OAEP (RFC 8017, 7.1.1) с SHA-256 и MGF1."""
+    h = _OAEP_HLEN
+    if len(message) > k - 2 * h - 2:
+        raise ValueError("Сообщение слишком длинное")
+    db = OAEP_HASH(label).digest() + b'\x00' * (k - len(message) - 2 * h - 2) + b'\x01' + message
+    seed = os.urandom(h)
+    masked_db = _xor(db, mgf1(seed, k - h - 1))
+    masked_seed = _xor(seed, mgf1(masked_db, h))
+    return int.from_bytes(b'\x00' + masked_seed + masked_db, 'big')
+
+def oaep_unpad(padded_int: int, k: int, label: bytes = b'') -> bytes:
+    h = _OAEP_HLEN
+    if k < 2 * h + 2:
+        raise ValueError("Ключ слишком короткий для OAEP")
+    padded = padded_int.to_bytes(k, 'big')
+    masked_seed, masked_db = padded[1:h + 1], padded[h + 1:]
+    seed = _xor(masked_seed, mgf1(masked_db, h))
+    db = _xor(masked_db, mgf1(seed, k - h - 1))
+
+    good = _ct_eq(padded[0], 0) & int(hmac.compare_digest(db[:h], OAEP_HASH(label).digest()))
+    # После хэша метки: нули, затем 01, затем сообщение
+    found = separator = 0
+    for i in range(h, len(db)):
+        one = _ct_eq(db[i], 1)
+        good &= found | one | _ct_eq(db[i], 0)  # до разделителя допустимы только нули
+        separator |= -(one & (1 - found)) & i
+        found |= one
+    good &= found
+    if not good:
+        raise ValueError("Ошибка расшифровки")
+    return db[separator + 1:]
+
+# Схемы паддинга: имя -> (паддинг, разбор, сколько байт блока занимает паддинг)
+PADDINGS = {
+    'pkcs1': (pkcs1_v15_pad, pkcs1_v15_unpad, 11),
+    'oaep': (oaep_pad, oaep_unpad, 2 * _OAEP_HLEN + 2),
+}
+
+# упрощённая эмуляция PKCS#1 v1.5; оставлена для совместимости и теперь
+# даёт настоящий PKCS#1 v1.5 (прежняя версия искала разделитель через rfind
+# и могла обрезать сообщение, содержащее байт 0x01)
+def simple_pad(message: bytes, k: int) -> int:
+    """Паддинг PKCS#1 v1.5 (см. pkcs1_v15_pad)."""
+    return pkcs1_v15_pad(message, k)
+
+def simple_unpad(padded_int: int, k: int) -> bytes:
+    return pkcs1_v15_unpad(padded_int, k)
+
+# --- Возведение в степень по модулю ---
+# Операции с открытым ключом (шифрование, проверка подписи) возводят в
+# степень через modpow, за которым стоит сменяемый движок (set_pow_engine).
+# По умолчанию это встроенный pow; оконные методы на Python полезны для
+# сравнения и экспериментов, а для повторяющегося основания есть
+# FixedBasePow с заранее вычисленной таблицей (как движок — через FixedBaseEngine).
+#
+# Оконные движки не работают за постоянное время: число умножений и
+# обращения к таблице зависят от бит показателя. Поэтому закрытый ключ
+# (rsa_private_op) и проверка простоты кандидатов в p, q всегда используют
+# встроенный pow, какой бы движок ни был установлен.
+
+class BuiltinPow:
+    """Встроенный pow."""
+    name = 'pow'
+
+    def __call__(self, base, exp, mod):
+        return pow(base, exp, mod)
+
+class FixedWindowPow:
+    """k-арный метод: показатель по окнам из window бит, таблица base^0 .. base^(2^window - 1)."""
+
+    def __init__(self, window=4):
+        self.window = window
+        self.name = f'окно {window}'
+
+    def __call__(self, base, exp, mod):
+        if exp < 0:
+            return pow(base, exp, mod)
+        w, mask = self.window, (1 << self.window) - 1
+        table = [1 % mod, base % mod]
+        for _ in range(2, 1 << w):
+            table.append(table[-1] * base % mod)
+        result = 1 % mod
+        for shift in range((exp.bit_length() + w - 1) // w * w - w, -1, -w):
+            for _ in range(w):
+                result = result * result % mod
+            digit = (exp >> shift) & mask
+            if digit:
+                result = result * table[digit] % mod
+        return result
+
+class SlidingWindowPow:
+    """Скользящее окно: нечётные степени base^1, base^3, .., окна начинаются и кончаются единицей."""
+
+    def __init__(self, window=5):
+        self.window = window
+        self.name = f'скользящее окно {window}'
+
+    def __call__(self, base, exp, mod):
+        if exp < 0:
+            return pow(base, exp, mod)
+        base %= mod
+        square = base * base % mod
+        odd = [base]
+        for _ in range((1 << (self.window - 1)) - 1):
+            odd.append(odd[-1] * square % mod)
+        bits = bin(exp)[2:] if exp else ''
+        result = 1 % mod
+        i = 0
+        while i < len(bits):
+            if bits[i] == '0':
+                result = result * result % mod
+                i += 1
+                continue
+            j = min(i + self.window, len(bits))
+            while bits[j - 1] == '0':
+                j -= 1
+            for _ in range(j - i):
+                result = result * result % mod
+            result = result * odd[int(bits[i:j], 2) >> 1] % mod
+            i = j
+        return result
+
+class FixedBasePow:
+    """Степени одного основания: table[i][j] = base^(j * 2^(window * i)).
+
+    Вызывается с одним показателем: fixed(exp) == pow(base, exp, mod).
+
+    Таблица строится один раз на показатели до max_bits бит; после этого
+    возведение — только умножения по одному на окно показателя, без
+    возведений в квадрат (примерно max_bits / window умножений против
+    ~max_bits квадратов у pow). Показатели длиннее max_bits уходят во встроенный pow.
+    """
+
+    def __init__(self, base, mod, max_bits, window=6):
+        self.base, self.mod, self.max_bits, self.window = base % mod, mod, max_bits, window
+        self.table = []
+        g = self.base
+        for _ in range(-(-max_bits // window)):
+            row = [1 % mod, g]
+            for _ in range(2, 1 << window):
+                row.append(row[-1] * g % mod)
+            self.table.append(row)
+            g = row[-1] * g % mod  # g^(2^window)
 
+    def __call__(self, exp):
+        if exp < 0 or exp.bit_length() > self.max_bits:
+            return pow(self.base, exp, self.mod)
+        mod, mask = self.mod, (1 << self.window) - 1
+        result = 1 % mod
+        for row in self.table:
+            if not exp:
+                break
+            digit = exp & mask
+            if digit:
+                result = result * row[digit] % mod
+            exp >>= self.window
+        return result
+
+class FixedBaseEngine:
+    """Движок для set_pow_engine поверх FixedBasePow.
+
+    Если основание и модуль совпадают с таблицей, степень берётся из неё,
+    иначе вызов уходит в fallback (по умолчанию встроенный pow).
+    """
+
+    def __init__(self, fixed, fallback=None):
+        self.fixed = fixed
+        self.fallback = fallback or BuiltinPow()
+        self.name = 'фикс. основание'
+
+    def __call__(self, base, exp, mod):
+        if mod == self.fixed.mod and base % mod == self.fixed.base:
+            return self.fixed(exp)
+        return self.fallback(base, exp, mod)
+
+_pow_engine = BuiltinPow()
+
+def set_pow_engine(engine):
+    """Меняет движок возведения в степень; возвращает прежний."""
+    global _pow_engine
+    previous, _pow_engine = _pow_engine, engine
+    return previous
+
+def modpow(base, exp, mod):
+    return _pow_engine(base, exp, mod)
+
+def benchmark_pow(bit_sizes=(1024, 2048), rounds=10, engines=None):
+    """Среднее время одного возведения (мс) для каждого движка и размера модуля.
+
+    Основание, показатель и модуль — случайные числа заданной длины. Для
+    FixedBasePow отдельно указаны время построения таблицы и время одного
+    возведения с общим основанием (через FixedBaseEngine). Возвращает строки
+    (движок, бит, мс); напечатать их — print_pow_benchmark.
+    """
+    engines = engines or [BuiltinPow(), FixedWindowPow(4), SlidingWindowPow(5)]
+    rows = []
+    for bits in bit_sizes:
+        mod = random.getrandbits(bits) | (1 << bits - 1) | 1
+        base = random.randrange(2, mod)
+        exps = [random.getrandbits(bits) for _ in range(rounds)]
+        expected = [pow(base, x, mod) for x in exps]
+        for engine in engines:
+            start = time.perf_counter()
+            results = [engine(base, x, mod) for x in exps]
+            rows.append((engine.name, bits, (time.perf_counter() - start) / rounds * 1000))
+            assert results == expected
+        start = time.perf_counter()
+        fixed = FixedBasePow(base, mod, bits)
+        rows.append(('фикс. основание: таблица', bits, (time.perf_counter() - start) * 1000))
+        engine = FixedBaseEngine(fixed)
+        start = time.perf_counter()
+        results = [engine(base, x, mod) for x in exps]
+        rows.append((engine.name, bits, (time.perf_counter() - start) / rounds * 1000))
+        assert results == expected
+    return rows
+
+def print_pow_benchmark(rows):
+    print(f"{'Движок':<28}{'Бит':>6}{'мс':>10}")
+    for name, bits, ms in rows:
+        print(f"{name:<28}{bits:>6}{ms:>10.3f}")
+
+def _small_primes(count):
+    """Первые count нечётных простых (решето Эратосфена)."""
+    limit = 64
+    while True:
+        sieve = bytearray([1]) * limit
+        sieve[0:2] = b'\x00\x00'
+        for i in range(2, int(limit ** 0.5) + 1):
+            if sieve[i]:
+                sieve[i * i::i] = bytes(len(range(i * i, limit, i)))
+        primes = [i for i in range(3, limit) if sieve[i]]
+        if len(primes) >= count:
+            return primes[:count]
+        limit *= 2
+
+# Таблица малых простых для пробного деления и просеивания кандидатов
+SMALL_PRIMES = _small_primes(2048)
+_SMALL_PRIMES_PRODUCT = math.prod(SMALL_PRIMES)
+
+def miller_rabin_rounds(bits):
+    """Число раундов Миллера–Рабина для случайного кандидата заданной битности.
+
+    Таблица из OpenSSL (BN_prime_checks_for_size, по HAC, табл. 4.4):
+    вероятность ошибки не больше 2^-80. Для больших чисел составное редко
+    проходит даже один раунд, поэтому раундов нужно меньше.
+    """
+    if bits >= 3747:
+        return 3
+    if bits >= 1345:
+        return 4
+    if bits >= 476:
+        return 5
+    if bits >= 400:
+        return 6
+    if bits >= 347:
+        return 7
+    if bits >= 308:
+        return 8
+    if bits >= 55:
+        return 27
+    return 34
+
+# Раундов Миллера–Рабина для произвольного n: на подобранном составном
+# числе один раунд ошибается с вероятностью до 1/4, 40 раундов — до 2^-80
+IS_PRIME_ROUNDS = 40
+
+def _miller_rabin(n, k):
+    """k раундов Миллера–Рабина для нечётного n > 3."""
     # Представляем n-1 как d * 2^s
     s = 0
     d = n - 1
@@ -52,36 +355,150 @@ def is_prime(n, k=5):
             return False
     return True
 
+def is_prime(n, k=IS_PRIME_ROUNDS):
+    """Тест Миллера–Рабина на простоту (вероятностный).
+
+    Сначала пробное деление на малые простые (один НОД с их произведением).
+    n может быть любым, в том числе специально подобранным, поэтому k по
+    умолчанию не зависит от битности; уменьшенное число раундов из
+    miller_rabin_rounds годится только для случайных кандидатов generate_prime.
+    """
+    if n < 2:
+        return False
+    if n in (2, 3):
+        return True
+    if n % 2 == 0:
+        return False
+    if n <= SMALL_PRIMES[-1]:
+        return n in SMALL_PRIMES
+    if math.gcd(n, _SMALL_PRIMES_PRODUCT) != 1:
+        return False
+    return _miller_rabin(n, k)
+
+def _sieve_window(start, size):
+    """Маска окна нечётных start, start+2, .., start+2(size-1): 0 — делится на малое простое."""
+    window = bytearray([1]) * size
+    for p in SMALL_PRIMES:
+        # start + 2j ≡ 0 (mod p)  =>  j ≡ -start * 2^(-1) (mod p)
+        j = (-start * ((p + 1) // 2)) % p
+        window[j::p] = bytes(len(range(j, size, p)))
+    return window
+
 def generate_prime(bits):
-    """Генерирует случайное простое число заданной битности."""
+    """Генерирует случайное простое число заданной битности.
+
+    От случайной нечётной точки просеивается окно нечётных чисел по таблице
+    малых простых, и только уцелевшие кандидаты проходят Миллера–Рабина.
+    Окно сдвигается дальше, пока не найдётся простое; если числа вышли за
+    нужную битность, выбирается новая точка.
+    """
+    if bits <= 16:
+        # Малые числа — прямой перебор, окно упёрлось бы в сами малые простые
+        while True:
+            n = random.getrandbits(bits)
+            n |= (1 << bits - 1) | 1
+            if is_prime(n):
+                return n
+
+    rounds = miller_rabin_rounds(bits)
+    size = 4 * bits  # простое встречается в среднем раз на ~0.35 * bits нечётных
     while True:
-        n = random.getrandbits(bits)
-        n |= (1 << bits - 1) | 1  # делаем нечётным и нужной длины
-        if is_prime(n):
-            return n
-
-def extended_gcd(a, b):
-    """Расширенный алгоритм Евклида: возвращает (g, x, y), где a*x + b*y = g = gcd(a, b)"""
-    if a == 0:
-        return b, 0, 1
-    g, x1, y1 = extended_gcd(b % a, a)
-    return g, y1 - (b // a) * x1, x1
+        start = random.getrandbits(bits)
+        start |= (1 << bits - 1) | 1  # делаем нечётным и нужной длины
+        while start.bit_length() == bits:
+            window = _sieve_window(start, size)
+            for j in range(size):
+                if window[j]:
+                    n = start + 2 * j
+                    if n.bit_length() != bits:
+                        break
+                    if _miller_rabin(n, rounds):
+                        return n
+            start += 2 * size
 
 def modinv(a, m):
-    """Находит обратное a по модулю m."""
-    g, x, _ = extended_gcd(a, m)
-    if g != 1:
-        raise ValueError('Обратный элемент не существует')
-    return x % m
-
-def generate_rsa_keys(bits=512):
-    """Генерирует пару ключей RSA."""
+    """Находит обратное a по модулю m (встроенный pow(a, -1, m))."""
+    try:
+        return pow(a, -1, m)
+    except ValueError:
+        raise ValueError('Обратный элемент не существует') from None
+
+def batch_modinv(values, m):
+    """Обратные ко всем values по модулю m одним обращением (трюк Монтгомери).
+
+    Считаются префиксные произведения, обращается только итоговое, а
+    обратные к отдельным элементам восстанавливаются обратным проходом:
+    3(n - 1) умножений и одна инверсия вместо n инверсий.
+    """
+    original = list(values)
+    values = [v % m for v in original]
+    if not values:
+        return []
+    prefix = [values[0]]
+    for v in values[1:]:
+        prefix.append(prefix[-1] * v % m)
+    try:
+        inv = modinv(prefix[-1], m)
+    except ValueError:
+        for i, v in enumerate(values):
+            g = math.gcd(v, m)
+            if g != 1:
+                raise ValueError(f'Обратный элемент не существует: values[{i}] = {original[i]}, '
+                                 f'НОД с модулем {g}') from None
+        raise
+    result = [0] * len(values)
+    for i in range(len(values) - 1, 0, -1):
+        result[i] = inv * prefix[i - 1] % m
+        inv = inv * values[i] % m
+    result[0] = inv
+    return result
+
+# Закрытый ключ в формате PKCS#1 (RFC 8017, 3.2): кроме d хранит p, q и
+# CRT-экспоненты, чтобы расшифрование и подпись шли по модулям p и q
+RSAPrivateKey = namedtuple('RSAPrivateKey', 'n e d p q dP dQ qInv')
+
+
+def rsa_private_key(p, q, e=65537):
+    """Собирает закрытый ключ с параметрами CRT из простых p и q."""
+    if p < q:
+        # При p > q в рекомбинации Гарнера h = qInv * (m1 - m2) mod p достаточно одного умножения на q
+        p, q = q, p
+    d = modinv(e, (p - 1) * (q - 1))
+    return RSAPrivateKey(p * q, e, d, p, q, d % (p - 1), d % (q - 1), modinv(q, p))
+
+def generate_prime_pair(bits, processes=1):
+    """Два различных простых p и q заданной битности.
+
+    При processes != 1 поиск идёт одновременно в нескольких процессах (None —
+    по числу ядер, но не меньше двух): каждый ищет своё простое от своей
+    случайной точки, берутся два первых найденных. Остальные поиски
+    прерываются — поэтому здесь multiprocessing.Pool с terminate, а не
+    ProcessPoolExecutor, который не умеет снимать уже запущенные задачи.
+    Процессы запускаются через spawn: функцию вызывает и фоновый поток
+    KeyPool, а fork из многопоточного процесса может зависнуть.
+    """
+    if processes == 1:
+        p = generate_prime(bits)
+        q = generate_prime(bits)
+        while p == q:
+            q = generate_prime(bits)
+        return p, q
+
+    workers = max(2, processes or os.cpu_count() or 2)
+    primes = set()
+    with multiprocessing.get_context('spawn').Pool(workers) as pool:  # выход из with вызывает terminate()
+        while len(primes) < 2:
+            for prime in pool.imap_unordered(generate_prime, [bits] * workers):
+                primes.add(prime)
+                if len(primes) == 2:
+                    break
+    return tuple(primes)
+
+def generate_rsa_keys(bits=512, processes=1):
+    """Генерирует пару ключей RSA; processes != 1 — поиск p и q в параллельных процессах."""
     # Функция generate_prime(bits) генерирует случайное простое число длиной bits бит
-    # Чтобы убедиться, что число простое, используется тест Миллера–Рабина (is_prime)
-    p = generate_prime(bits // 2)
-    q = generate_prime(bits // 2)
-    while p == q:
-        q = generate_prime(bits // 2)
+    # Кандидаты просеиваются по малым простым, уцелевшие проверяются тестом Миллера–Рабина
+    p, q = generate_prime_pair(bits // 2, processes)
 
     # n это публичная часть ключа
     n = p * q
@@ -97,24 +514,115 @@ def generate_rsa_keys(bits=512):
         if math.gcd(e, phi) != 1:
             e = 17
 
-    # Обратное число к e по модулю phi. Вычисляется с помощью расширенного алгоритма Евклида
-    d = modinv(e, phi)
-
+    # Закрытая экспонента d = e^(-1) mod phi и параметры CRT считаются в rsa_private_key
     public_key = (e, n)
-    private_key = (d, n)
+    private_key = rsa_private_key(p, q, e)
     return public_key, private_key
 
+class KeyPool:
+    """Фоновый пул готовых пар ключей RSA.
+
+    Поток в фоне держит до size пар про запас, между генерациями выдерживая
+    паузу refill_interval секунд (ограничение нагрузки). По умолчанию поток
+    ищет простые сам (processes=1); при processes != 1 поиск идёт в
+    процессах, запущенных через spawn. get() отдаёт готовую пару сразу, а
+    если пул опустел — ждёт следующую пару от фонового потока, не запуская
+    вторую генерацию параллельно с ним.
+    """
+
+    def __init__(self, size=4, bits=2048, refill_interval=0.0, processes=1):
+        self.bits = bits
+        self.refill_interval = refill_interval
+        self.processes = processes
+        self._keys = queue.Queue(maxsize=size)
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._fill, daemon=True)
+        self._thread.start()
+
+    def _fill(self):
+        while not self._stop.is_set():
+            pair = generate_rsa_keys(self.bits, self.processes)
+            while not self._stop.is_set():
+                try:
+                    self._keys.put(pair, timeout=0.1)
+                    break
+                except queue.Full:
+                    continue
+            self._stop.wait(self.refill_interval)
+
+    def get(self, timeout=None):
+        """Пара (открытый ключ, закрытый ключ).
+
+        Пустой пул ждёт не дольше timeout секунд (None — без ограничения), затем queue.Empty.
+        """
+        return self._keys.get(timeout=timeout)
+
+    def __len__(self):
+        return self._keys.qsize()
+
+    def close(self):
+        """Останавливает фоновую генерацию (текущая пара дорабатывается)."""
+        self._stop.set()
+        self._thread.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
 def rsa_encrypt(message: int, public_key):
     """Шифрует целое число message с помощью открытого ключа."""
     e, n = public_key
-    return pow(message, e, n)
+    return modpow(message, e, n)
+
+def _modulus(key):
+    """Модуль n любого ключа: (e, n), (d, n) или RSAPrivateKey."""
+    return key.n if isinstance(key, RSAPrivateKey) else key[1]
+
+def rsa_private_op(value: int, private_key):
+    """Возведение в закрытую степень: value^d mod n.
+
+    Для RSAPrivateKey считается по китайской теореме об остатках: две
+    экспоненты половинной длины по модулям p и q (примерно в 3-4 раза быстрее)
+    и рекомбинация Гарнера. Старые ключи (d, n) обрабатываются напрямую.
+    Всегда встроенный pow: оконные движки не постоянны по времени.
+    """
+    if not isinstance(private_key, RSAPrivateKey):
+        d, n = private_key
+        return pow(value, d, n)
+    k = private_key
+    m1 = pow(value % k.p, k.dP, k.p)
+    m2 = pow(value % k.q, k.dQ, k.q)
+    h = k.qInv * (m1 - m2) % k.p
+    return m2 + h * k.q
 
 def rsa_decrypt(ciphertext: int, private_key):
     """Расшифровывает целое число ciphertext с помощью закрытого ключа."""
-    d, n = private_key
-    return pow(ciphertext, d, n)
+    return rsa_private_op(ciphertext, private_key)
+
+def rsa_sign(message: int, private_key):
+    """Подписывает целое число message (message < n) закрытым ключом."""
+    return rsa_private_op(message, private_key)
+
+def rsa_verify(message: int, signature: int, public_key):
+    """Проверяет подпись: signature^e mod n должно совпасть с message."""
+    e, n = public_key
+    return 0 <= signature < n and modpow(signature, e, n) == message
 
 
+def rsa_encrypt_message(message: bytes, public_key, padding='oaep') -> int:
+    """Шифрует байты (не длиннее k - паддинг) с паддингом 'oaep' или 'pkcs1'."""
+    pad, _, _ = PADDINGS[padding]
+    e, n = public_key
+    return modpow(pad(message, (n.bit_length() + 7) // 8), e, n)
+
+def rsa_decrypt_message(ciphertext: int, private_key, padding='oaep') -> bytes:
+    """Расшифровывает результат rsa_encrypt_message."""
+    _, unpad, _ = PADDINGS[padding]
+    k = (_modulus(private_key).bit_length() + 7) // 8
+    return unpad(rsa_private_op(ciphertext, private_key), k)
+
 def int_to_bytes(x: int):
     return x.to_bytes((x.bit_length() + 7) // 8, 'big')
 
@@ -122,17 +630,267 @@ def bytes_to_int(b):
     return int.from_bytes(b, 'big')
 
 
+# --- Пакетная обработка ---
+
+# Сколько чисел уходит в процесс одной задачей: мелкие операции шлются
+# пачками, чтобы пересылка между процессами не съедала выигрыш
+BATCH_SIZE = 256
+
+def _encrypt_slice(messages, public_key):
+    e, n = public_key
+    return [modpow(m, e, n) for m in messages]
+
+def _decrypt_slice(ciphertexts, private_key):
+    return [rsa_private_op(c, private_key) for c in ciphertexts]
+
+def _verify_slice(pairs, public_key):
+    return [rsa_verify(m, s, public_key) for m, s in pairs]
+
+# Пулы процессов по числу рабочих: создаются при первом пакетном вызове и
+# переиспользуются, чтобы не платить за запуск процессов на каждый вызов
+_EXECUTORS = {}
+_EXECUTORS_LOCK = threading.Lock()
+
+def _shared_executor(processes):
+    with _EXECUTORS_LOCK:
+        pool = _EXECUTORS.get(processes)
+        if pool is None:
+            pool = ProcessPoolExecutor(max_workers=processes,
+                                       mp_context=multiprocessing.get_context('spawn'))
+            _EXECUTORS[processes] = pool
+        return pool
+
+def shutdown_executors():
+    """Останавливает общие пулы процессов пакетных функций."""
+    with _EXECUTORS_LOCK:
+        pools = list(_EXECUTORS.values())
+        _EXECUTORS.clear()
+    for pool in pools:
+        pool.shutdown()
+
+def _run_batched(func, items, key, processes, executor=None):
+    """func(срез, key) по срезам BATCH_SIZE.
+
+    Срезы уходят в executor, если он передан, иначе при processes != 1 — в
+    общий пул процессов (None — по числу ядер), который живёт между вызовами.
+    """
+    items = list(items)
+    if (executor is None and processes == 1) or len(items) <= BATCH_SIZE:
+        return func(items, key)
+    pool = executor if executor is not None else _shared_executor(processes)
+    slices = [items[i:i + BATCH_SIZE] for i in range(0, len(items), BATCH_SIZE)]
+    parts = pool.map(func, slices, [key] * len(slices))
+    return [value for part in parts for value in part]
+
+def rsa_encrypt_many(messages, public_key, processes=1, executor=None):
+    """Шифрует список целых чисел."""
+    return _run_batched(_encrypt_slice, messages, public_key, processes, executor)
+
+def rsa_decrypt_many(ciphertexts, private_key, processes=1, executor=None):
+    """Расшифровывает список целых чисел (с CRT для RSAPrivateKey)."""
+    return _run_batched(_decrypt_slice, ciphertexts, private_key, processes, executor)
+
+def rsa_sign_many(messages, private_key, processes=1, executor=None):
+    """Подписывает список целых чисел."""
+    return _run_batched(_decrypt_slice, messages, private_key, processes, executor)
+
+def rsa_verify_many(messages, signatures, public_key, processes=1, executor=None):
+    """Проверяет пары (сообщение, подпись); список результатов по каждой паре."""
+    messages, signatures = list(messages), list(signatures)
+    if len(messages) != len(signatures):
+        raise ValueError(f"Число сообщений ({len(messages)}) и подписей ({len(signatures)}) не совпадает")
+    return _run_batched(_verify_slice, zip(messages, signatures), public_key, processes, executor)
+
+def rsa_encrypt_bytes(data: bytes, public_key, processes=1, padding='oaep', executor=None) -> bytes:
+    """Шифрует байты произвольной длины.
+
+    Данные режутся на куски по k минус длина паддинга (k — длина модуля в
+    байтах), каждый дополняется паддингом ('oaep' или 'pkcs1') и шифруется в
+    блок ровно из k байт.
+    """
+    pad, _, overhead = PADDINGS[padding]
+    k = (_modulus(public_key).bit_length() + 7) // 8
+    step = k - overhead
+    if step <= 0:
+        raise ValueError("Ключ слишком короткий для выбранного паддинга")
+    chunks = [data[i:i + step] for i in range(0, len(data), step)] or [b'']
+    ciphertexts = rsa_encrypt_many([pad(chunk, k) for chunk in chunks], public_key, processes, executor)
+    return b''.join(c.to_bytes(k, 'big') for c in ciphertexts)
+
+def rsa_decrypt_bytes(data: bytes, private_key, processes=1, padding='oaep', executor=None) -> bytes:
+    """Расшифровывает результат rsa_encrypt_bytes."""
+    _, unpad, _ = PADDINGS[padding]
+    k = (_modulus(private_key).bit_length() + 7) // 8
+    if len(data) % k:
+        raise ValueError("Длина шифртекста не кратна длине блока")
+    blocks = [int.from_bytes(data[i:i + k], 'big') for i in range(0, len(data), k)]
+    return b''.join(unpad(m, k) for m in rsa_decrypt_many(blocks, private_key, processes, executor))
+
+
+
+# --- Хранение ключей: DER и PEM в формате PKCS#1 (RFC 8017, приложение A.1) ---
+# RSAPublicKey  ::= SEQUENCE { n, e }
+# RSAPrivateKey ::= SEQUENCE { version = 0, n, e, d, p, q, dP, dQ, qInv }
+
+def _der_length(length):
+    if length < 0x80:
+        return bytes([length])
+    raw = length.to_bytes((length.bit_length() + 7) // 8, 'big')
+    return bytes([0x80 | len(raw)]) + raw
+
+def _der_integer(value):
+    # Лишний старший байт, чтобы неотрицательное число не читалось как отрицательное
+    raw = value.to_bytes(value.bit_length() // 8 + 1, 'big')
+    return b'\x02' + _der_length(len(raw)) + raw
+
+def _der_sequence(values):
+    body = b''.join(_der_integer(v) for v in values)
+    return b'\x30' + _der_length(len(body)) + body
+
+def _der_read(data, pos, tag):
+    """Читает элемент с тегом tag с позиции pos: (содержимое, позиция за элементом)."""
+    if pos + 2 > len(data) or data[pos] != tag:
+        raise ValueError("Неверная структура DER")
+    length = data[pos + 1]
+    pos += 2
+    if length & 0x80:
+        size = length & 0x7F
+        if size == 0 or size > 4 or pos + size > len(data):
+            raise ValueError("Неверная длина DER")
+        length = int.from_bytes(data[pos:pos + size], 'big')
+        pos += size
+    if pos + length > len(data):
+        raise ValueError("Неверная длина DER")
+    return data[pos:pos + length], pos + length
+
+def _der_integers(data):
+    """Последовательность целых из DER: SEQUENCE { INTEGER, ... }."""
+    body, end = _der_read(data, 0, 0x30)
+    if end != len(data):
+        raise ValueError("Лишние данные после ключа")
+    values, pos = [], 0
+    while pos < len(body):
+        raw, pos = _der_read(body, pos, 0x02)
+        value = int.from_bytes(raw, 'big', signed=True)
+        if value < 0:
+            raise ValueError("Отрицательное число в ключе")
+        values.append(value)
+    return values
+
+# Открытая экспонента длиннее этого — почти наверняка закрытая d из старого
+# ключа (d, n); OpenSSL ограничивает e тем же числом бит
+_MAX_PUBLIC_EXPONENT_BITS = 64
+
+def public_key_to_der(public_key) -> bytes:
+    e, n = public_key
+    if e.bit_length() > _MAX_PUBLIC_EXPONENT_BITS:
+        raise TypeError("Похоже на закрытый ключ (d, n); для сохранения нужен RSAPrivateKey")
+    return _der_sequence([n, e])
+
+def private_key_to_der(private_key) -> bytes:
+    k = private_key
+    return _der_sequence([0, k.n, k.e, k.d, k.p, k.q, k.dP, k.dQ, k.qInv])
+
+def _check_private_key(key):
+    """Согласованность полей: испорченный d или параметр CRT дал бы неверные расшифровки и подписи."""
+    if key.p < 2 or key.q < 2 or key.p * key.q != key.n:
+        raise ValueError("Параметры закрытого ключа не согласованы: n != p*q")
+    if key.e * key.d % math.lcm(key.p - 1, key.q - 1) != 1:
+        raise ValueError("Параметры закрытого ключа не согласованы: e*d != 1 mod lcm(p-1, q-1)")
+    if key.dP != key.d % (key.p - 1) or key.dQ != key.d % (key.q - 1):
+        raise ValueError("Параметры закрытого ключа не согласованы: dP или dQ")
+    if key.qInv * key.q % key.p != 1:
+        raise ValueError("Параметры закрытого ключа не согласованы: qInv")
+
+def key_from_der(data: bytes):
+    """Открытый (e, n) или закрытый RSAPrivateKey — по числу полей."""
+    values = _der_integers(data)
+    if len(values) == 2:
+        n, e = values
+        return e, n
+    if len(values) == 9 and values[0] == 0:
+        key = RSAPrivateKey(*values[1:])
+        _check_private_key(key)
+        return key
+    raise ValueError("Это не ключ RSA в формате PKCS#1")
+
+_PEM_LABELS = {'public': 'RSA PUBLIC KEY', 'private': 'RSA PRIVATE KEY'}
+
+def key_to_der(key) -> bytes:
+    if isinstance(key, RSAPrivateKey):
+        return private_key_to_der(key)
+    return public_key_to_der(key)
+
+def key_to_pem(key) -> str:
+    label = _PEM_LABELS['private' if isinstance(key, RSAPrivateKey) else 'public']
+    body = base64.b64encode(key_to_der(key)).decode('ascii')
+    lines = [body[i:i + 64] for i in range(0, len(body), 64)]
+    return f"-----BEGIN {label}-----\n" + "\n".join(lines) + f"\n-----END {label}-----\n"
+
+def key_from_pem(text: str):
+    lines = text.strip().splitlines()
+    begin = re.fullmatch(r'-----BEGIN ([A-Z ]+)-----', lines[0]) if lines else None
+    if (len(lines) < 2 or begin is None or begin.group(1) not in _PEM_LABELS.values()
+            or lines[-1] != f"-----END {begin.group(1)}-----"):
+        raise ValueError("Неверный формат PEM")
+    label = begin.group(1)
+    key = key_from_der(base64.b64decode(''.join(lines[1:-1]), validate=True))
+    if label != _PEM_LABELS['private' if isinstance(key, RSAPrivateKey) else 'public']:
+        raise ValueError("Метка PEM не соответствует типу ключа")
+    return key
+
+def save_key(key, path, encoding='pem'):
+    """Записывает ключ в файл: encoding 'pem' или 'der'.
+
+    Закрытый ключ должен быть RSAPrivateKey: в старом (d, n) нет полей
+    PKCS#1, и такой кортеж отклоняется с TypeError.
+    """
+    data = key_to_pem(key).encode('ascii') if encoding == 'pem' else key_to_der(key)
+    with open(path, 'wb') as f:
+        f.write(data)
+
+# Разобранные ключи процесса: путь -> (mtime_ns, размер, ключ)
+_KEY_CACHE = {}
+_KEY_CACHE_LOCK = threading.Lock()
+
+def load_key(path):
+    """Читает ключ из файла PEM или DER.
+
+    Разобранный ключ кэшируется по пути; запись сбрасывается, когда у файла
+    меняется время изменения или размер, поэтому повторные загрузки того же
+    файла не читают и не разбирают его заново.
+    """
+    path = os.path.realpath(path)
+    stat = os.stat(path)
+    with _KEY_CACHE_LOCK:
+        cached = _KEY_CACHE.get(path)
+    if cached and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+        return cached[2]
+    with open(path, 'rb') as f:
+        data = f.read()
+    key = key_from_pem(data.decode('ascii')) if data.startswith(b'-----') else key_from_der(data)
+    with _KEY_CACHE_LOCK:
+        _KEY_CACHE[path] = (stat.st_mtime_ns, stat.st_size, key)
+    return key
+
+def clear_key_cache():
+    with _KEY_CACHE_LOCK:
+        _KEY_CACHE.clear()
+
 if __name__ == "__main__":
     # Генерация ключей
     pub, priv = generate_rsa_keys(bits=512)  
     print("Открытый ключ (e, n):", pub)
-    print("Закрытый ключ (d, n):", priv)
-    k = 256
+    print("Закрытый ключ (d, n):", (priv.d, priv.n))
+    print("Параметры CRT (p, q, dP, dQ, qInv):", (priv.p, priv.q, priv.dP, priv.dQ, priv.qInv))
+    k = (pub[1].bit_length() + 7) // 8
 
     msg = "Меня зовут Максим! Hi".encode('utf-8')
     print(f"Закодированное сообщение в байтах: {msg}")
-    padded_int = simple_pad(msg, k)
-    # print(f'"С солью": {padded_int}')
+    padded_int = pkcs1_v15_pad(msg, k)
+    print(f'"С солью" (PKCS#1 v1.5): {padded_int}')
+    cipher_padded = rsa_encrypt(padded_int, pub)
+    print(f'Расшифровано с паддингом: {pkcs1_v15_unpad(rsa_decrypt(cipher_padded, priv), k) == msg}')
 
     msg_int = bytes_to_int(msg)
     #RSA работает только с целыми числами, а не со строками или байтами
@@ -149,5 +907,87 @@ if __name__ == "__main__":
     decrypted_msg = int_to_bytes(decrypted_int).decode('utf-8')
     print(f'Восстановленное исходное сообщение: {decrypted_msg}')
 
+    # Подпись закрытым ключом и проверка открытым
+    signature = rsa_sign(msg_int, priv)
+    print(f'Подпись верна: {rsa_verify(msg_int, signature, pub)}')
+
+    # Сравнение скорости: CRT против возведения в степень d по полному модулю
+    start = time.perf_counter()
+    big_pub, big_priv = generate_rsa_keys(bits=2048, processes=None)
+    print(f'RSA-2048: ключи за {time.perf_counter() - start:.2f} с (p и q ищутся в параллельных процессах)')
+    c = rsa_encrypt(msg_int, big_pub)
+    rounds = 50
+    start = time.perf_counter()
+    for _ in range(rounds):
+        rsa_decrypt(c, (big_priv.d, big_priv.n))
+    plain_time = time.perf_counter() - start
+    start = time.perf_counter()
+    for _ in range(rounds):
+        rsa_decrypt(c, big_priv)
+    crt_time = time.perf_counter() - start
+    print(f'RSA-2048, {rounds} расшифрований: без CRT {plain_time:.3f} с, с CRT {crt_time:.3f} с '
+          f'(ускорение в {plain_time / crt_time:.1f} раза)')
+
+    # Пакетное обращение: 2000 обратных по модулю n за одну инверсию
+    values = [random.randrange(2, big_pub[1]) for _ in range(2000)]
+    start = time.perf_counter()
+    single = [modinv(v, big_pub[1]) for v in values]
+    single_time = time.perf_counter() - start
+    start = time.perf_counter()
+    batch = batch_modinv(values, big_pub[1])
+    batch_time = time.perf_counter() - start
+    print(f'2000 обратных: по одному {single_time:.3f} с, трюком Монтгомери {batch_time:.3f} с, '
+          f'совпадают: {batch == single}')
+
+    # Сохранение ключей в PEM/DER и загрузка через кэш
+    with tempfile.TemporaryDirectory() as folder:
+        save_key(big_priv, os.path.join(folder, 'private.pem'))
+        save_key(big_pub, os.path.join(folder, 'public.der'), encoding='der')
+        start = time.perf_counter()
+        loaded = load_key(os.path.join(folder, 'private.pem'))
+        first_time = time.perf_counter() - start
+        start = time.perf_counter()
+        load_key(os.path.join(folder, 'private.pem'))
+        cached_time = time.perf_counter() - start
+        print(f'Ключи из файлов совпадают: {loaded == big_priv and load_key(os.path.join(folder, "public.der")) == big_pub}; '
+              f'разбор {first_time * 1000:.3f} мс, из кэша {cached_time * 1000:.3f} мс')
+
+    # Движки возведения в степень против встроенного pow
+    print_pow_benchmark(benchmark_pow(bit_sizes=(1024, 2048), rounds=5))
+
+    # Пул готовых ключей: после заполнения ключи выдаются мгновенно
+    with KeyPool(size=2, bits=1024) as pool:
+        while len(pool) < 2:
+            time.sleep(0.1)
+        start = time.perf_counter()
+        pool.get()
+        print(f'Ключ из пула за {(time.perf_counter() - start) * 1000:.3f} мс')
+
+    # OAEP (SHA-256, MGF1) — паддинг по умолчанию; для него нужен ключ длиннее 512 бит
+    cipher_oaep = rsa_encrypt_message(msg, big_pub)
+    print(f'OAEP: расшифровано верно: {rsa_decrypt_message(cipher_oaep, big_priv) == msg}')
+
+    # Сообщение длиннее модуля: блоки с паддингом OAEP
+    long_msg = ("Длинное сообщение. " * 40).encode('utf-8')
+    encrypted = rsa_encrypt_bytes(long_msg, big_pub)
+    print(f'Длинное сообщение: {len(long_msg)} байт -> {len(encrypted)} байт шифртекста, '
+          f'расшифровано верно: {rsa_decrypt_bytes(encrypted, big_priv) == long_msg}')
+
+    # Пакетная обработка коротких токенов: один пул процессов на подпись и проверку
+    tokens = [random.getrandbits(128) for _ in range(600)]
+    with ProcessPoolExecutor(mp_context=multiprocessing.get_context('spawn')) as executor:
+        start = time.perf_counter()
+        signatures = rsa_sign_many(tokens, big_priv, executor=executor)
+        valid = rsa_verify_many(tokens, signatures, big_pub, executor=executor)
+    print(f'{len(tokens)} токенов подписано и проверено за {time.perf_counter() - start:.2f} с, '
+          f'все подписи верны: {all(valid)}')
+    try:
+        rsa_verify_many(tokens, signatures[:1], big_pub)
+        mismatch_rejected = False
+    except ValueError:
+        mismatch_rejected = True
+    assert mismatch_rejected, "Лишние сообщения без подписи не должны проходить проверку"
+    print(f'Сообщения без пары-подписи отклонены: {mismatch_rejected}')
+
     # assert message == decrypted, "Ошибка расшифровки!"
     # print("\n Шифрование/расшифрование прошло успешно!")
\ No newline at end of file